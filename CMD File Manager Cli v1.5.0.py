@@ -4,12 +4,42 @@ __group__ = "system"
 __desc__ = "CMD Cli File Manager: Full suite with history and quick links"
 
 import os
+import sys
+import errno
+import struct
+import bisect
+import ctypes
+import ctypes.util
+import select
+import glob
+import csv
+import gzip
+import json
+import queue
+import shlex
+import hashlib
+import time
+import re
+import stat
 import shutil
+import sqlite3
+import argparse
 import platform
+import tarfile
+import tempfile
+import threading
+import zipfile
+import zlib
 import subprocess
+from collections import OrderedDict, deque, namedtuple
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, ThreadPoolExecutor, wait
 from datetime import datetime
+from itertools import chain
 from pathlib import Path
 
+if os.name == "nt":
+    import msvcrt
+
 # --- COLOR AND FORMATTING CONFIGURATION ---
 G = "\033[92m"      # Green (Success)
 R = "\033[91m"      # Red (Error)
@@ -18,9 +48,1500 @@ B = "\033[94m"      # Blue (Frames)
 BOLD = "\033[1m"    # Bold
 RESET = "\033[0m"   # Reset formatting
 
+# --- LISTING ENGINE ---
+# One record per directory entry; kind is "dir", "file" or "other".
+Entry = namedtuple("Entry", "name kind size mtime")
+
+def scan_dir(path="."):
+    """Lists a directory in a single os.scandir pass, returning (dirs, files).
+
+    Entry types come from the cached DirEntry data, so no extra isdir/isfile
+    calls are made per name (on Windows the stat data is free as well).
+    """
+    dirs, files = [], []
+    with os.scandir(path) as it:
+        for e in it:
+            try:
+                kind = "dir" if e.is_dir() else "file" if e.is_file() else "other"
+                st = e.stat()
+                size, mtime = st.st_size, st.st_mtime
+            except OSError:
+                kind, size, mtime = "other", 0, 0.0
+            if kind == "dir": dirs.append(Entry(e.name, kind, 0, mtime))
+            elif kind == "file": files.append(Entry(e.name, kind, size, mtime))
+    dirs.sort(key=lambda x: x.name)
+    files.sort(key=lambda x: x.name)
+    return dirs, files
+
+class ListingCache:
+    """LRU cache of scan_dir results keyed by absolute directory path.
+
+    A cached listing is reused while the directory's (mtime, inode, device)
+    stamp is unchanged; changes made by the manager itself are dropped
+    explicitly via invalidate(), since mtime resolution can be coarse.
+    """
+    def __init__(self, max_dirs=32):
+        self.max_dirs = max_dirs
+        self._items = OrderedDict()
+
+    @staticmethod
+    def _stamp(path):
+        st = os.stat(path)
+        return (st.st_mtime_ns, st.st_ino, st.st_dev)
+
+    def get(self, path="."):
+        path = os.path.abspath(path)
+        stamp = self._stamp(path)
+        hit = self._items.get(path)
+        if hit and hit[0] == stamp:
+            self._items.move_to_end(path)
+            return hit[1]
+        listing = scan_dir(path)
+        self._items[path] = (stamp, listing)
+        self._items.move_to_end(path)
+        while len(self._items) > self.max_dirs:
+            self._items.popitem(last=False)
+        return listing
+
+    def invalidate(self, *paths):
+        """Drops listings of the given paths and of their parent directories."""
+        for p in paths:
+            p = os.path.abspath(p)
+            self._items.pop(p, None)
+            self._items.pop(os.path.dirname(p), None)
+
+    def clear(self):
+        self._items.clear()
+
+    def apply(self, path, events):
+        """Patches a cached listing with watcher events instead of relisting it.
+
+        events are (kind, name) with kind "add", "remove", "modify" or
+        "rescan". Returns True only if the set of listed names changed, since
+        rows show names alone; a file being written does not cause a repaint.
+        """
+        path = os.path.abspath(path)
+        hit = self._items.get(path)
+        if not events: return False
+        if hit is None or any(kind == "rescan" for kind, _ in events):
+            self._items.pop(path, None)
+            return True
+        dirs, files = hit[1]
+        changed = False
+        # Only the final state of each name matters, so bursts collapse to one stat
+        for name, kind in {name: kind for kind, name in events if name}.items():
+            before = after = None
+            for lst in (dirs, files):
+                i = bisect.bisect_left(lst, (name,))
+                if i < len(lst) and lst[i].name == name: before = lst.pop(i).kind
+            if kind != "remove":
+                try:
+                    st = os.stat(os.path.join(path, name))
+                    if stat.S_ISDIR(st.st_mode): after = "dir"; bisect.insort(dirs, Entry(name, "dir", 0, st.st_mtime))
+                    elif stat.S_ISREG(st.st_mode): after = "file"; bisect.insort(files, Entry(name, "file", st.st_size, st.st_mtime))
+                except OSError:
+                    pass
+            changed = changed or before != after
+        try: self._items[path] = (self._stamp(path), (dirs, files))
+        except OSError: self._items.pop(path, None)
+        return changed
+
+def _legacy_scan_dir(path="."):
+    """Original listdir + isdir/isfile listing, kept for benchmarks."""
+    items = sorted(os.listdir(path))
+    dirs = [d for d in items if os.path.isdir(os.path.join(path, d))]
+    files = [f for f in items if os.path.isfile(os.path.join(path, f))]
+    return dirs, files
+
+# --- COPY ENGINE ---
+# Per-file latency dominates on network shares, so files are copied by a pool.
+COPY_WORKERS = min(32, (os.cpu_count() or 4) * 4)
+
+def plan_copy(src, dst, errors=None):
+    """Walks src once, returning (dirs, jobs) where jobs are (source, target, size).
+
+    Entries that cannot be read (broken links, denied folders) are skipped
+    and appended to errors as (path, exception) when a list is given.
+    """
+    dirs, jobs, stack = [dst], [], [(src, dst)]
+    while stack:
+        s_dir, d_dir = stack.pop()
+        try:
+            with os.scandir(s_dir) as it:
+                for e in it:
+                    target = os.path.join(d_dir, e.name)
+                    try:
+                        if e.is_dir():
+                            dirs.append(target)
+                            stack.append((e.path, target))
+                        else:
+                            jobs.append((e.path, target, e.stat().st_size))
+                    except OSError as err:
+                        if errors is not None: errors.append((e.path, err))
+        except OSError as err:
+            if errors is not None: errors.append((s_dir, err))
+    return dirs, jobs
+
+def _fmt_eta(seconds):
+    seconds = int(seconds)
+    return f"{seconds // 3600:d}:{seconds // 60 % 60:02d}:{seconds % 60:02d}"
+
+class CopyProgress:
+    """Thread-safe counters for a running copy, with rate and ETA estimates."""
+    def __init__(self, files, total_bytes):
+        self.files, self.total_bytes = files, total_bytes
+        self.done = self.done_bytes = 0
+        self.errors = []
+        self.start = time.perf_counter()
+        self._lock = threading.Lock()
+
+    def update(self, size, error=None):
+        with self._lock:
+            self.done += 1
+            self.done_bytes += size
+            if error: self.errors.append(error)
+
+    def line(self):
+        elapsed = max(time.perf_counter() - self.start, 1e-6)
+        bps = self.done_bytes / elapsed
+        left = self.total_bytes - self.done_bytes
+        eta = left / bps if bps else 0
+        return (f"{self.done}/{self.files} files  {self.done / elapsed:7.0f} files/s  "
+                f"{bps / 2**20:7.1f} MB/s  ETA {_fmt_eta(eta)}")
+
+def print_progress(progress):
+    sys.stdout.write(f"\r {Y}{progress.line()}{RESET}  ")
+    sys.stdout.flush()
+
+class CopyEngine:
+    """Copies a planned list of files with a worker pool and reports progress.
+
+    report(progress) is called from the calling thread at most every
+    `interval` seconds and once at the end.
+    """
+    def __init__(self, workers=None, copy_func=shutil.copy2, report=print_progress, interval=0.25):
+        self.workers = max(1, workers or COPY_WORKERS)
+        self.copy_func = copy_func
+        self.report = report
+        self.interval = interval
+
+    def _copy_one(self, job):
+        src, dst, size = job
+        try:
+            self.copy_func(src, dst)
+            return size, None
+        except OSError as e:
+            return size, (src, e)
+
+    def copy_files(self, jobs):
+        progress = CopyProgress(len(jobs), sum(j[2] for j in jobs))
+        last = time.perf_counter()
+        with ThreadPoolExecutor(self.workers) as pool:
+            pending = set()
+            for job in chain(jobs, [None]):
+                if job: pending.add(pool.submit(self._copy_one, job))
+                # Bound the queue so huge trees don't hold millions of futures;
+                # the trailing None drains whatever is left.
+                while pending and (job is None or len(pending) >= self.workers * 4):
+                    finished, pending = wait(pending, timeout=self.interval, return_when=FIRST_COMPLETED)
+                    for f in finished: progress.update(*f.result())
+                    if self.report and time.perf_counter() - last >= self.interval:
+                        last = time.perf_counter()
+                        self.report(progress)
+        if self.report:
+            self.report(progress)
+            if self.report is print_progress: print()
+        return progress
+
+    def copy_tree(self, src, dst):
+        errors = []
+        dirs, jobs = plan_copy(src, dst, errors)
+        for d in dirs: os.makedirs(d, exist_ok=True)
+        progress = self.copy_files(jobs)
+        progress.errors.extend(errors)
+        return progress
+
+# --- DELETE ENGINE ---
+def _unlink(path):
+    try: os.unlink(path)
+    except PermissionError:
+        # Read-only files on Windows need their write bit back first; on POSIX
+        # the error comes from the folder, so the file is left untouched
+        if os.name != "nt": raise
+        os.chmod(path, os.lstat(path).st_mode | stat.S_IWRITE)
+        os.unlink(path)
+
+class DeleteProgress:
+    def __init__(self):
+        self.done = 0
+        self.errors = []
+        self.start = time.perf_counter()
+        self._lock = threading.Lock()
+
+    def update(self, count, errors=()):
+        with self._lock:
+            self.done += count
+            self.errors.extend(errors)
+
+    def line(self):
+        elapsed = max(time.perf_counter() - self.start, 1e-6)
+        return f"{self.done} entries removed  {self.done / elapsed:8.0f} entries/s"
+
+class DeleteEngine:
+    """Parallel recursive delete: files are unlinked per folder from a worker
+    pool while the walk continues; folders are removed bottom-up at the end.
+    Links to folders are unlinked, never followed."""
+    def __init__(self, workers=None, report=print_progress, interval=0.25):
+        self.workers = max(1, workers or COPY_WORKERS)
+        self.report = report
+        self.interval = interval
+
+    @staticmethod
+    def _unlink_many(paths):
+        errors = []
+        for p in paths:
+            try: _unlink(p)
+            except FileNotFoundError: pass
+            except OSError as e: errors.append((p, e))
+        return len(paths) - len(errors), errors
+
+    def delete_tree(self, root):
+        progress = DeleteProgress()
+        isjunction = getattr(os.path, "isjunction", lambda p: False)
+        if os.path.islink(root) or isjunction(root):
+            # A linked root goes away as a link; its target is left alone
+            try:
+                os.unlink(root) if os.path.islink(root) else os.rmdir(root)
+                progress.update(1)
+            except OSError as e: progress.update(0, [(root, e)])
+            if self.report is print_progress: print(progress.line())
+            return progress
+        dirs, stack, pending = [], [root], set()
+        last = time.perf_counter()
+
+        def collect(done):
+            nonlocal last
+            for f in done: progress.update(*f.result())
+            if self.report and time.perf_counter() - last >= self.interval:
+                last = time.perf_counter()
+                self.report(progress)
+
+        with ThreadPoolExecutor(self.workers) as pool:
+            while stack:
+                d = stack.pop()
+                dirs.append(d)
+                files = []
+                try:
+                    with os.scandir(d) as it:
+                        for e in it:
+                            if e.is_dir(follow_symlinks=False): stack.append(e.path)
+                            else: files.append(e.path)
+                except OSError as e:
+                    progress.update(0, [(d, e)])
+                if files: pending.add(pool.submit(self._unlink_many, files))
+                if len(pending) >= self.workers * 4:
+                    done, pending = wait(pending, return_when=FIRST_COMPLETED)
+                    collect(done)
+            while pending:
+                done, pending = wait(pending, timeout=self.interval, return_when=FIRST_COMPLETED)
+                collect(done)
+        # Children were discovered after their parents, so reverse order is bottom-up
+        for d in reversed(dirs):
+            try: os.rmdir(d); progress.update(1)
+            except OSError as e: progress.update(0, [(d, e)])
+        if self.report:
+            self.report(progress)
+            if self.report is print_progress: print()
+        return progress
+
+# --- INCREMENTAL BACKUP ---
+BACKUP_DIR = Path.home() / ".polsoft" / "psCLI" / "Backup"
+
+def file_hash(path, algo="sha256", bufsize=2**20):
+    h = hashlib.new(algo)
+    with open(path, "rb") as f:
+        for block in iter(lambda: f.read(bufsize), b""): h.update(block)
+    return h.hexdigest()
+
+def walk_stats(root, errors=None):
+    """Returns ({relpath: (size, mtime_ns)}, set of relative dirs) for a tree.
+
+    Unreadable entries are left out and appended to errors as (relpath, exception).
+    """
+    files, dirs, stack = {}, set(), [""]
+    while stack:
+        rel = stack.pop()
+        try:
+            with os.scandir(os.path.join(root, rel)) as it:
+                for e in it:
+                    r = os.path.join(rel, e.name)
+                    try:
+                        if e.is_dir():
+                            dirs.add(r)
+                            stack.append(r)
+                        else:
+                            st = e.stat()
+                            files[r] = (st.st_size, st.st_mtime_ns)
+                    except OSError as err:
+                        if errors is not None: errors.append((r, err))
+        except OSError as err:
+            if errors is not None: errors.append((rel, err))
+    return files, dirs
+
+class BackupManifest:
+    """Persisted state of one source -> destination mirror: {relpath: [size, mtime_ns, hash]}."""
+    def __init__(self, src, dst):
+        self.src, self.dst = os.path.abspath(src), os.path.abspath(dst)
+        key = hashlib.sha1(f"{self.src}|{self.dst}".encode("utf-8")).hexdigest()[:16]
+        self.path = BACKUP_DIR / f"manifest_{key}.json"
+        self.files = {}
+        if self.path.exists():
+            with open(self.path, "r", encoding="utf-8") as f:
+                self.files = json.load(f).get("files", {})
+
+    def save(self):
+        BACKUP_DIR.mkdir(parents=True, exist_ok=True)
+        tmp = self.path.with_suffix(".tmp")
+        with open(tmp, "w", encoding="utf-8") as f:
+            json.dump({"source": self.src, "target": self.dst, "saved": datetime.now().isoformat(),
+                       "files": self.files}, f)
+        os.replace(tmp, self.path)
+
+def incremental_mirror(src, dst, delete=False, verify_hash=False, engine=None):
+    """Mirrors src into dst copying only files that changed since the last run.
+
+    Changes are detected from the manifest (size + mtime); with verify_hash a
+    file whose content hash still matches is skipped even if it was touched.
+    Returns (copied, skipped, deleted, errors).
+    """
+    manifest = BackupManifest(src, dst)
+    unreadable = []
+    files, dirs = walk_stats(src, unreadable)
+    jobs, hashes, skipped = [], {}, 0
+    for rel, (size, mtime) in files.items():
+        old = manifest.files.get(rel)
+        # The manifest only vouches for the source; a missing or resized copy is redone
+        try: in_place = os.stat(os.path.join(dst, rel)).st_size == size
+        except OSError: in_place = False
+        if in_place and old and old[0] == size and old[1] == mtime:
+            skipped += 1
+            continue
+        if verify_hash:
+            hashes[rel] = file_hash(os.path.join(src, rel))
+            if in_place and old and old[2] == hashes[rel]:
+                manifest.files[rel] = [size, mtime, hashes[rel]]
+                skipped += 1
+                continue
+        jobs.append((os.path.join(src, rel), os.path.join(dst, rel), size))
+
+    for d in chain([""], sorted(dirs)): os.makedirs(os.path.join(dst, d), exist_ok=True)
+    progress = (engine or CopyEngine()).copy_files(jobs)
+    failed = {path for path, _ in progress.errors}
+    for s_path, _, _ in jobs:
+        if s_path in failed: continue
+        rel = os.path.relpath(s_path, src)
+        manifest.files[rel] = [*files[rel], hashes.get(rel)]
+
+    deleted = 0
+    progress.errors.extend(unreadable)
+    if delete:
+        # Files under an entry that could not be read are not known to be gone
+        keep = tuple(rel for rel, _ in unreadable)
+        gone = [rel for rel in manifest.files if rel not in files
+                and not any(rel == k or rel.startswith(os.path.join(k, "")) for k in keep)]
+        for rel in gone:
+            try: os.remove(os.path.join(dst, rel)); deleted += 1
+            except FileNotFoundError: pass
+            except OSError as e: progress.errors.append((rel, e)); continue
+            del manifest.files[rel]
+        # Prune folders emptied by the deletions, deepest first, never above dst
+        # and never one that still exists in the source
+        parents = set()
+        for rel in gone:
+            d = os.path.dirname(rel)
+            while d and d not in parents:
+                parents.add(d)
+                d = os.path.dirname(d)
+        for d in sorted(parents - dirs, key=lambda d: d.count(os.sep), reverse=True):
+            try: os.rmdir(os.path.join(dst, d))
+            except OSError: pass
+    manifest.save()
+    return len(jobs) - len(failed), skipped, deleted, progress.errors
+
+# --- BLOCK DELTA SYNC ---
+DELTA_BLOCK = 2**20                  # compared and rewritten in units of this size
+DELTA_MIN_SIZE = 8 * 2**20           # smaller files are simply recopied
+SIG_DIR = BACKUP_DIR / "signatures"
+_SIG_HEADER = struct.Struct("<4sIQq")   # magic, block size, file size, mtime_ns
+
+def _sig_path(dst):
+    return SIG_DIR / (hashlib.sha1(os.path.abspath(dst).encode("utf-8")).hexdigest() + ".sig")
+
+def _load_signature(dst, st, block):
+    """Returns the saved block digests of dst if they still describe it, else None."""
+    try:
+        with open(_sig_path(dst), "rb") as f:
+            magic, bs, size, mtime = _SIG_HEADER.unpack(f.read(_SIG_HEADER.size))
+            if (magic, bs, size, mtime) != (b"PSIG", block, st.st_size, st.st_mtime_ns): return None
+            data = f.read()
+        return [data[i:i + 16] for i in range(0, len(data), 16)]
+    except (OSError, struct.error):
+        return None
+
+def delta_sync_file(src, dst, block=DELTA_BLOCK):
+    """Updates dst in place so it equals src, rewriting only blocks that differ.
+
+    Block digests of the previous run are kept under BACKUP_DIR/signatures,
+    so when dst was not touched since, it is not read at all - only src is.
+    Returns (blocks written, total blocks).
+    """
+    signature = _load_signature(dst, os.stat(dst), block)
+    digests, written = [], 0
+    with open(src, "rb") as fs, open(dst, "r+b") as fd:
+        for i, data in enumerate(iter(lambda: fs.read(block), b"")):
+            digest = hashlib.blake2b(data, digest_size=16).digest()
+            if signature is not None:
+                old = signature[i] if i < len(signature) else None
+            else:
+                fd.seek(i * block)
+                old = hashlib.blake2b(fd.read(block), digest_size=16).digest()
+            if old != digest:
+                fd.seek(i * block)
+                fd.write(data)
+                written += 1
+            digests.append(digest)
+        fd.truncate(fs.tell())
+    shutil.copystat(src, dst)
+    st = os.stat(dst)
+    SIG_DIR.mkdir(parents=True, exist_ok=True)
+    with open(_sig_path(dst), "wb") as f:
+        f.write(_SIG_HEADER.pack(b"PSIG", block, st.st_size, st.st_mtime_ns))
+        f.write(b"".join(digests))
+    return written, len(digests)
+
+def sync_tree(src, dst, engine=None):
+    """rsync-like mirror: unchanged files (size + mtime) are skipped, big changed
+    files get a block delta, everything else is copied. Returns (copied, delta
+    files, blocks written, blocks total, skipped, errors)."""
+    unreadable = []
+    files, dirs = walk_stats(src, unreadable)
+    for d in chain([""], sorted(dirs)): os.makedirs(os.path.join(dst, d), exist_ok=True)
+    jobs, skipped, stats = [], 0, []
+    for rel, (size, mtime) in files.items():
+        target = os.path.join(dst, rel)
+        try: st = os.stat(target)
+        except FileNotFoundError: st = None
+        if st and st.st_size == size and st.st_mtime_ns == mtime:
+            skipped += 1
+            continue
+        jobs.append((os.path.join(src, rel), target, size))
+
+    def sync_one(s_path, d_path):
+        if os.path.getsize(s_path) >= DELTA_MIN_SIZE and os.path.isfile(d_path):
+            stats.append(delta_sync_file(s_path, d_path))
+        else:
+            shutil.copy2(s_path, d_path)
+
+    engine = engine or CopyEngine()
+    progress = CopyEngine(engine.workers, copy_func=sync_one, report=engine.report).copy_files(jobs)
+    written = sum(w for w, _ in stats)
+    total = sum(t for _, t in stats)
+    return len(jobs) - len(stats) - len(progress.errors), len(stats), written, total, skipped, progress.errors + unreadable
+
+# --- SNAPSHOT STORE ---
+CHUNK_SIZE = 4 * 2**20
+
+class SnapshotStore:
+    """Content-addressed backup store with fixed-size, deduplicated chunks.
+
+    Layout: <root>/chunks/ab/<sha256> holds each distinct chunk once and
+    <root>/snapshots/<name>.json maps relpath -> [size, mtime_ns, [chunk ids]].
+    Files whose size and mtime match the previous snapshot reuse its chunk
+    list without being read at all.
+    """
+    def __init__(self, root):
+        self.root = Path(root)
+        self.chunks = self.root / "chunks"
+        self.snapshots = self.root / "snapshots"
+        self.new_chunks = 0
+        self._lock = threading.Lock()
+
+    def _chunk_path(self, digest):
+        return self.chunks / digest[:2] / digest
+
+    def _put(self, data):
+        digest = hashlib.sha256(data).hexdigest()
+        path = self._chunk_path(digest)
+        if not path.exists():
+            path.parent.mkdir(parents=True, exist_ok=True)
+            tmp = path.with_name(f"{digest}.{threading.get_ident()}.tmp")
+            with open(tmp, "wb") as f: f.write(data)
+            os.replace(tmp, path)
+            with self._lock: self.new_chunks += 1
+        return digest
+
+    def _store_file(self, path):
+        with open(path, "rb") as f:
+            return [self._put(block) for block in iter(lambda: f.read(CHUNK_SIZE), b"")]
+
+    def list_snapshots(self):
+        if not self.snapshots.exists(): return []
+        return sorted(p.stem for p in self.snapshots.glob("*.json"))
+
+    def load(self, name):
+        with open(self.snapshots / f"{name}.json", "r", encoding="utf-8") as f:
+            return json.load(f)
+
+    def snapshot(self, src, workers=None, report=print_progress):
+        """Stores a new snapshot of src. Returns (name, files, reused, new chunks, errors)."""
+        # Only a snapshot of the same folder vouches for unchanged files
+        source = os.path.abspath(src)
+        previous = next((snap["files"] for snap in map(self.load, reversed(self.list_snapshots()))
+                         if snap.get("source") == source), {})
+        unreadable = []
+        files, dirs = walk_stats(src, unreadable)
+        index, jobs = {}, []
+        for rel, (size, mtime) in files.items():
+            old = previous.get(rel)
+            if old and old[0] == size and old[1] == mtime:
+                index[rel] = old
+            else:
+                jobs.append((os.path.join(src, rel), rel, size))
+        reused = len(index)
+
+        def store(path, rel):
+            size, mtime = files[rel]
+            index[rel] = [size, mtime, self._store_file(path)]
+
+        self.new_chunks = 0
+        progress = CopyEngine(workers, copy_func=store, report=report).copy_files(jobs)
+        name = base = datetime.now().strftime("%Y-%m-%d_%H%M%S")
+        self.snapshots.mkdir(parents=True, exist_ok=True)
+        n = 1
+        while (self.snapshots / f"{name}.json").exists():   # several runs within one second
+            n += 1
+            name = f"{base}_{n}"
+        with open(self.snapshots / f"{name}.tmp", "w", encoding="utf-8") as f:
+            json.dump({"source": os.path.abspath(src), "created": datetime.now().isoformat(),
+                       "dirs": sorted(dirs), "files": index}, f)
+        os.replace(self.snapshots / f"{name}.tmp", self.snapshots / f"{name}.json")
+        return name, len(files), reused, self.new_chunks, progress.errors + unreadable
+
+    def _restore_file(self, chunk_ids, target, mtime):
+        with open(target, "wb") as out:
+            for digest in chunk_ids:
+                with open(self._chunk_path(digest), "rb") as f:
+                    shutil.copyfileobj(f, out)
+        os.utime(target, ns=(mtime, mtime))
+
+    def restore(self, name, target, workers=None, report=print_progress):
+        """Streams snapshot `name` back into target, one chunk at a time."""
+        snap = self.load(name)
+        files = snap["files"]
+        for d in chain([""], snap.get("dirs", [])): os.makedirs(os.path.join(target, d), exist_ok=True)
+        jobs = [(rel, os.path.join(target, rel), meta[0]) for rel, meta in files.items()]
+        restore = lambda rel, dst: self._restore_file(files[rel][2], dst, files[rel][1])
+        progress = CopyEngine(workers, copy_func=restore, report=report).copy_files(jobs)
+        return len(jobs), progress.errors
+
+# --- FILENAME INDEX ---
+INDEX_DIR = Path.home() / ".polsoft" / "psCLI" / "Index"
+
+def _trigrams(name):
+    name = name.lower()
+    return {name[i:i + 3] for i in range(len(name) - 2)}
+
+class FilenameIndex:
+    """Persistent trigram index of every name below one root (SQLite).
+
+    update() rescans only directories whose mtime changed since the last run
+    (adding, removing or renaming an entry bumps its parent's mtime), so
+    keeping the index current costs one stat per directory, not per file.
+    """
+    SCHEMA = """
+        CREATE TABLE IF NOT EXISTS dirs (id INTEGER PRIMARY KEY, path TEXT UNIQUE, mtime INTEGER);
+        CREATE TABLE IF NOT EXISTS names (id INTEGER PRIMARY KEY, dir INTEGER, name TEXT, is_dir INTEGER);
+        CREATE INDEX IF NOT EXISTS names_dir ON names (dir);
+        CREATE TABLE IF NOT EXISTS grams (gram TEXT, name INTEGER, PRIMARY KEY (gram, name)) WITHOUT ROWID;
+    """
+
+    def __init__(self, root="."):
+        self.root = os.path.abspath(root)
+        key = hashlib.sha1(self.root.encode("utf-8")).hexdigest()[:16]
+        INDEX_DIR.mkdir(parents=True, exist_ok=True)
+        self.path = INDEX_DIR / f"names_{key}.sqlite"
+        with self._connect() as db: db.executescript(self.SCHEMA)
+
+    def _connect(self):
+        return sqlite3.connect(self.path)
+
+    def is_empty(self):
+        with self._connect() as db:
+            return db.execute("SELECT 1 FROM dirs LIMIT 1").fetchone() is None
+
+    def _drop_dir_names(self, db, dir_id):
+        rows = db.execute("SELECT id, name FROM names WHERE dir = ?", (dir_id,)).fetchall()
+        db.executemany("DELETE FROM grams WHERE gram = ? AND name = ?",
+                       ((g, nid) for nid, name in rows for g in _trigrams(name)))
+        db.execute("DELETE FROM names WHERE dir = ?", (dir_id,))
+
+    def update(self, full=False):
+        """Brings the index up to date. Returns (directories seen, directories rescanned)."""
+        seen, rescanned = set(), 0
+        with self._connect() as db:
+            if full: db.executescript("DELETE FROM grams; DELETE FROM names; DELETE FROM dirs;")
+            known = {p: (i, m) for i, p, m in db.execute("SELECT id, path, mtime FROM dirs")}
+            stack = [""]
+            while stack:
+                rel = stack.pop()
+                seen.add(rel)
+                try: mtime = os.stat(os.path.join(self.root, rel)).st_mtime_ns
+                except OSError: continue
+                dir_id, old_mtime = known.get(rel, (None, None))
+                if dir_id is not None and old_mtime == mtime:
+                    subdirs = [n for (n,) in db.execute("SELECT name FROM names WHERE dir = ? AND is_dir = 1", (dir_id,))]
+                else:
+                    rescanned += 1
+                    if dir_id is None:
+                        dir_id = db.execute("INSERT INTO dirs (path, mtime) VALUES (?, ?)", (rel, mtime)).lastrowid
+                    else:
+                        self._drop_dir_names(db, dir_id)
+                        db.execute("UPDATE dirs SET mtime = ? WHERE id = ?", (mtime, dir_id))
+                    subdirs = []
+                    try:
+                        with os.scandir(os.path.join(self.root, rel)) as it:
+                            for e in it:
+                                is_dir = e.is_dir(follow_symlinks=False)
+                                if is_dir: subdirs.append(e.name)
+                                nid = db.execute("INSERT INTO names (dir, name, is_dir) VALUES (?, ?, ?)",
+                                                 (dir_id, e.name, is_dir)).lastrowid
+                                db.executemany("INSERT OR IGNORE INTO grams VALUES (?, ?)",
+                                               ((g, nid) for g in _trigrams(e.name)))
+                    except OSError: pass
+                stack.extend(os.path.join(rel, n) for n in subdirs)
+            for path, (dir_id, _) in known.items():
+                if path not in seen:
+                    self._drop_dir_names(db, dir_id)
+                    db.execute("DELETE FROM dirs WHERE id = ?", (dir_id,))
+        return len(seen), rescanned
+
+    def search(self, query, limit=None):
+        """Yields relative paths whose name contains query (case-insensitive)."""
+        q = query.lower()
+        grams = sorted(_trigrams(q))
+        sql = "SELECT d.path, n.name FROM names n JOIN dirs d ON d.id = n.dir"
+        if grams:
+            sql += " WHERE n.id IN (" + " INTERSECT ".join(["SELECT name FROM grams WHERE gram = ?"] * len(grams)) + ")"
+        with self._connect() as db:
+            found = 0
+            for rel, name in db.execute(sql, grams):
+                if q in name.lower():
+                    yield os.path.join(rel, name)
+                    found += 1
+                    if limit and found >= limit: return
+
+# --- CONTENT SEARCH ---
+def iter_entries(root):
+    """Yields a DirEntry for everything below root, depth-first, without following dir links."""
+    stack = [root]
+    while stack:
+        try:
+            with os.scandir(stack.pop()) as it:
+                for e in it:
+                    yield e
+                    if e.is_dir(follow_symlinks=False): stack.append(e.path)
+        except OSError:
+            continue
+
+class ContentSearch:
+    """Greps a tree from a thread pool, streaming (path, line, text) as matches are found.
+
+    Files are read in 1 MiB chunks and only chunks containing the needle are
+    split into lines. A line longer than a chunk is never held whole, and long
+    lines are shown as the text around their first match. Files with a NUL byte
+    in their first 8 KB are treated as binary and skipped. Set .cancel to
+    stop early; iteration ends either way.
+    """
+    def __init__(self, root, text, workers=None, bufsize=2**20):
+        self.root, self.needle, self.bufsize = root, text.encode("utf-8"), bufsize
+        self.workers = max(1, workers or COPY_WORKERS)
+        self.cancel = threading.Event()
+        self.files = self.skipped = 0
+        self._counts = threading.Lock()   # files/skipped are bumped from the workers
+        self._results = queue.Queue()
+        self._slots = threading.BoundedSemaphore(self.workers * 4)
+        self._thread = threading.Thread(target=self._run, daemon=True)
+
+    def start(self):
+        self._thread.start()
+        return self
+
+    def __iter__(self):
+        while (item := self._results.get()) is not None:
+            yield item
+
+    def _run(self):
+        try:
+            with ThreadPoolExecutor(self.workers) as pool:
+                for e in iter_entries(self.root):
+                    if self.cancel.is_set(): break
+                    if not e.is_file(): continue
+                    self._slots.acquire()
+                    pool.submit(self._grep, e.path)
+        finally:
+            self._results.put(None)
+
+    def _grep(self, path):
+        try:
+            with open(path, "rb") as f:
+                first = f.read(8192)
+                if b"\0" in first:
+                    with self._counts: self.skipped += 1
+                    return
+                with self._counts: self.files += 1
+                # reported: the unfinished line in carry was already reported
+                lineno, carry, chunk, reported = 1, b"", first, False
+                keep = len(self.needle) - 1   # enough for a needle split across reads
+                while chunk and not self.cancel.is_set():
+                    buf = carry + chunk
+                    cut = buf.rfind(b"\n") + 1
+                    if cut:
+                        lineno = self._scan(path, buf[:cut], lineno, reported)
+                        carry, reported = buf[cut:], False
+                    else:
+                        carry = buf
+                    if len(carry) > self.bufsize:
+                        if not reported and self.needle in carry:
+                            self._put(path, lineno, carry)
+                            reported = True
+                        carry = carry[len(carry) - keep:]
+                    chunk = f.read(self.bufsize)
+                self._scan(path, carry, lineno, reported)
+        except OSError:
+            with self._counts: self.skipped += 1
+        finally:
+            self._slots.release()
+
+    def _scan(self, path, data, lineno, reported=False):
+        if self.needle in data:
+            for i, line in enumerate(data.split(b"\n")):
+                if self.needle in line and not (i == 0 and reported):
+                    self._put(path, lineno + i, line)
+        return lineno + data.count(b"\n")
+
+    def _put(self, path, lineno, line):
+        if len(line) > 1000:
+            at = line.find(self.needle)
+            line = line[max(0, at - 100):at + len(self.needle) + 100]
+        self._results.put((path, lineno, line.decode("utf-8", "replace").strip()))
+
+# --- DISK USAGE ANALYZER ---
+def _fmt_size(n):
+    for unit in ("B", "KB", "MB", "GB", "TB"):
+        if n < 1024 or unit == "TB": return f"{n:.0f} {unit}" if unit == "B" else f"{n:.1f} {unit}"
+        n /= 1024
+
+class DiskUsage:
+    """du-style recursive sizes, scanned in parallel and cached per directory.
+
+    Each directory's own file total and subfolder list are cached with its
+    mtime, so a repeated analysis only rescans folders whose entries changed.
+    Files that grow in place do not touch their folder's mtime; use clear()
+    (full rescan) when exact numbers matter.
+    """
+    def __init__(self):
+        self._dirs = {}
+
+    def clear(self):
+        self._dirs.clear()
+
+    def _scan(self, path):
+        try: mtime = os.stat(path).st_mtime_ns
+        except OSError: return 0, 0, []
+        hit = self._dirs.get(path)
+        if hit and hit[0] == mtime: return hit[1:]
+        total = files = 0
+        subdirs = []
+        try:
+            with os.scandir(path) as it:
+                for e in it:
+                    try:
+                        if e.is_dir(follow_symlinks=False): subdirs.append(e.path)
+                        else:
+                            total += e.stat(follow_symlinks=False).st_size
+                            files += 1
+                    except OSError: pass
+        except OSError: pass
+        self._dirs[path] = (mtime, total, files, subdirs)
+        return total, files, subdirs
+
+    def breakdown(self, root=".", workers=None):
+        """Returns [(name, bytes, files, is_dir)] for root's children, largest first."""
+        root = os.path.abspath(root)
+        top, pending = {}, {}
+        with ThreadPoolExecutor(max(1, workers or COPY_WORKERS)) as pool:
+            with os.scandir(root) as it:
+                for e in it:
+                    if e.is_dir(follow_symlinks=False):
+                        top[e.name] = [0, 0, True]
+                        pending[pool.submit(self._scan, e.path)] = e.name
+                    else:
+                        try: top[e.name] = [e.stat(follow_symlinks=False).st_size, 1, False]
+                        except OSError: pass
+            # Every folder is its own task, so one huge child still uses the whole pool
+            while pending:
+                done, _ = wait(pending, return_when=FIRST_COMPLETED)
+                for f in done:
+                    name = pending.pop(f)
+                    total, files, subdirs = f.result()
+                    top[name][0] += total
+                    top[name][1] += files
+                    for sd in subdirs: pending[pool.submit(self._scan, sd)] = name
+        return sorted(((n, *v) for n, v in top.items()), key=lambda r: r[1], reverse=True)
+
+# --- LARGE FILE COPY ---
+LARGE_FILE_THRESHOLD = 64 * 2**20   # copy_item/move_item switch to copy_large_file above this
+CHECKPOINT_BYTES = 256 * 2**20      # resume state is fsynced and saved this often
+
+def _copy_range(fin, fout, offset, count):
+    """Copies up to count bytes at offset between fds, in-kernel where the OS allows."""
+    if hasattr(os, "copy_file_range"):
+        try: return os.copy_file_range(fin, fout, count, offset, offset)
+        except OSError as e:
+            if e.errno not in (errno.EXDEV, errno.ENOSYS, errno.EINVAL, errno.EOPNOTSUPP): raise
+    if sys.platform.startswith("linux"):
+        os.lseek(fout, offset, os.SEEK_SET)
+        return os.sendfile(fout, fin, offset, count)
+    os.lseek(fin, offset, os.SEEK_SET)
+    os.lseek(fout, offset, os.SEEK_SET)
+    return os.write(fout, os.read(fin, min(count, 2**20)))
+
+def copy_large_file(src, dst, report=None):
+    """Resumable, checksummed copy of one big file.
+
+    Data goes to <dst>.pscli-part; every CHECKPOINT_BYTES the part is fsynced
+    and the verified offset saved next to it, so an interrupted copy of the
+    same (unchanged) source continues from there. The finished part is
+    compared with the source by streamed sha256 before it replaces dst.
+    report(done, total, bytes_per_second) is called after every block.
+    """
+    if os.path.isdir(dst): dst = os.path.join(dst, os.path.basename(src))
+    part, state_file = dst + ".pscli-part", dst + ".pscli-part.json"
+    st = os.stat(src)
+    source = {"source": os.path.abspath(src), "size": st.st_size, "mtime_ns": st.st_mtime_ns}
+    offset = 0
+    if os.path.exists(state_file) and os.path.exists(part):
+        with open(state_file, "r", encoding="utf-8") as f: state = json.load(f)
+        if all(state.get(k) == v for k, v in source.items()): offset = state["offset"]
+
+    started, resumed_at = time.perf_counter(), offset
+    with open(src, "rb") as fin, open(part, "r+b" if offset else "wb") as fout:
+        fout.truncate(offset)
+        checkpoint = offset
+        while offset < st.st_size:
+            n = _copy_range(fin.fileno(), fout.fileno(), offset, min(CHECKPOINT_BYTES, st.st_size - offset, 2**30))
+            if n == 0: raise OSError(f"Unexpected end of {src} at {offset}")
+            offset += n
+            if offset - checkpoint >= CHECKPOINT_BYTES or offset == st.st_size:
+                os.fsync(fout.fileno())
+                with open(state_file, "w", encoding="utf-8") as f: json.dump({**source, "offset": offset}, f)
+                checkpoint = offset
+            if report: report(offset, st.st_size, (offset - resumed_at) / max(time.perf_counter() - started, 1e-6))
+
+    with ThreadPoolExecutor(2) as pool:
+        a, b = pool.map(file_hash, (src, part))
+    if a != b:
+        os.remove(state_file)
+        raise OSError(f"Checksum mismatch for {dst}, partial copy discarded")
+    shutil.copystat(src, part)
+    os.replace(part, dst)
+    os.remove(state_file)
+    return dst
+
+def print_file_progress(done, total, bps):
+    eta = (total - done) / bps if bps else 0
+    sys.stdout.write(f"\r {Y}{done * 100 / max(total, 1):5.1f}%  {_fmt_size(done)} / {_fmt_size(total)}  "
+                     f"{bps / 2**20:7.1f} MB/s  ETA {_fmt_eta(eta)}{RESET}  ")
+    sys.stdout.flush()
+
+# --- BATCH MODE ---
+# Script lines (shell-style quoting, '#' starts a comment):
+#   delete <glob>                      copy <glob> <folder>
+#   move <glob> <folder>               rename <glob> <regex> <replacement>
+# Quote rename arguments, since unquoted backslashes are dropped:
+#   rename *.jpg 'IMG_(\d+)' 'photo_\1'
+BatchOp = namedtuple("BatchOp", "line action src dst")
+BATCH_ARGS = {"delete": 1, "copy": 2, "move": 2, "rename": 3}
+
+def plan_batch(lines):
+    """Expands a batch script into {source folder: [BatchOp]} without touching anything.
+
+    Raises ValueError listing every syntax error or conflicting target.
+    """
+    ops, problems = [], []
+    for no, raw in enumerate(lines, 1):
+        try: words = shlex.split(raw, comments=True, posix=os.name != "nt")
+        except ValueError as e: problems.append(f"line {no}: {e}"); continue
+        if not words: continue
+        action, args = words[0].lower(), words[1:]
+        if BATCH_ARGS.get(action) != len(args):
+            problems.append(f"line {no}: expected '{action} <glob>' with {BATCH_ARGS.get(action, '?')} argument(s)")
+            continue
+        matches = sorted(glob.glob(args[0], recursive=True))
+        if not matches: print(f" {Y}[i] line {no}: '{args[0]}' matches nothing{RESET}")
+        planned = len(ops)
+        for src in matches:
+            if action == "delete": dst = None
+            elif action == "rename":
+                try: dst = os.path.join(os.path.dirname(src), re.sub(args[1], args[2], os.path.basename(src)))
+                except re.error as e: problems.append(f"line {no}: {e}"); break
+                if dst == src: continue
+            else: dst = os.path.join(args[1], os.path.basename(src))
+            ops.append(BatchOp(no, action, os.path.normpath(src), dst and os.path.normpath(dst)))
+        if action == "rename" and matches and len(ops) == planned:
+            print(f" {Y}[i] line {no}: '{args[1]}' renames none of the {len(matches)} match(es){RESET}")
+
+    sources, targets = {}, {}
+    for op in ops:
+        prev = sources.get(op.src)
+        if prev and (op.action != "copy" or prev[1] != "copy"):
+            problems.append(f"line {op.line}: {op.src} is also used by '{prev[1]}' on line {prev[0]}")
+        sources.setdefault(op.src, (op.line, op.action))
+        if op.dst:
+            if op.dst in targets: problems.append(f"line {op.line}: {op.dst} is also written on line {targets[op.dst]}")
+            targets[op.dst] = op.line
+    if problems: raise ValueError("\n".join(problems))
+
+    groups = OrderedDict()
+    for op in ops: groups.setdefault(os.path.dirname(op.src) or ".", []).append(op)
+    # Operations on nested paths, or writing a path another operation reads,
+    # must keep script order, so run them as one group
+    paths = [p for op in ops for p in (op.src, op.dst) if p]
+    dirs = [op.src for op in ops if os.path.isdir(op.src)]
+    if any(p != d and p.startswith(d + os.sep) for d in dirs for p in paths) \
+            or any(op.dst in sources for op in ops if op.dst):
+        groups = OrderedDict([("(dependent paths, serial)", ops)])
+    return groups
+
+def _run_op(op):
+    if op.action == "delete":
+        if os.path.isdir(op.src) and not os.path.islink(op.src):
+            errors = DeleteEngine(report=None).delete_tree(op.src).errors
+            if errors: raise OSError(f"{len(errors)} entries not removed, first: {errors[0][0]}: {errors[0][1]}")
+        else: os.remove(op.src)
+    elif op.action == "copy":
+        if os.path.isdir(op.src): shutil.copytree(op.src, op.dst, dirs_exist_ok=True)
+        else: shutil.copy2(op.src, op.dst)
+    elif op.action == "move":
+        shutil.move(op.src, op.dst)
+    elif op.action == "rename":
+        if os.path.exists(op.dst): raise FileExistsError(op.dst)
+        os.rename(op.src, op.dst)
+
+def run_batch(groups, workers=None):
+    """Runs each folder group in order, different groups concurrently. Returns (done, errors)."""
+    def run_group(group):
+        done, errors = 0, []
+        for op in group:
+            try: _run_op(op); done += 1
+            except OSError as e: errors.append((op, e))
+        return done, errors
+
+    done, errors = 0, []
+    with ThreadPoolExecutor(max(1, workers or COPY_WORKERS)) as pool:
+        for d, errs in pool.map(run_group, groups.values()):
+            done += d
+            errors.extend(errs)
+    return done, errors
+
+def batch_main(script, dry_run=False):
+    with open(script, "r", encoding="utf-8") as f:
+        try: groups = plan_batch(f)
+        except ValueError as e:
+            print(f"{R} [!] Batch script rejected:\n{e}{RESET}")
+            return 1
+    total = sum(len(g) for g in groups.values())
+    print(f" {Y}PLAN:{RESET} {total} operation(s) in {len(groups)} folder group(s)")
+    if dry_run:
+        for folder, ops in groups.items():
+            print(f"\n {B}[{folder}]{RESET}")
+            for op in ops: print(f"   {op.action:<6} {op.src}" + (f"  ->  {op.dst}" if op.dst else ""))
+        return 0
+    start = time.perf_counter()
+    done, errors = run_batch(groups)
+    elapsed = max(time.perf_counter() - start, 1e-6)
+    for op, e in errors: print(f"{R} [!] line {op.line}: {op.action} {op.src}: {e}{RESET}")
+    print(f"{G} [+] {done}/{total} done in {elapsed:.2f} s ({done / elapsed:.0f} ops/s).{RESET}")
+    return 1 if errors else 0
+
+# --- LISTING EXPORT ---
+def export_listing(root, target, fmt="csv", report=None):
+    """Streams a recursive listing of root to target as CSV or JSON Lines.
+
+    Rows are written as the walk yields them, so memory stays constant no
+    matter how big the tree is; a .gz target is gzip-compressed on the fly.
+    report(text) is called every 10000 rows. Returns the number of rows.
+    """
+    opener = gzip.open if str(target).endswith(".gz") else open
+    rows = 0
+    with opener(target, "wt", encoding="utf-8", newline="") as f:
+        if fmt == "csv":
+            writer = csv.writer(f)
+            writer.writerow(("path", "type", "size", "mtime"))
+        for e in iter_entries(root):
+            try: st = e.stat(follow_symlinks=False)
+            except OSError: continue
+            kind = "dir" if e.is_dir(follow_symlinks=False) else "link" if e.is_symlink() else "file"
+            row = (os.path.relpath(e.path, root), kind, st.st_size if kind == "file" else 0,
+                   datetime.fromtimestamp(st.st_mtime).isoformat(timespec="seconds"))
+            if fmt == "csv": writer.writerow(row)
+            else: f.write(json.dumps(dict(zip(("path", "type", "size", "mtime"), row)), ensure_ascii=False) + "\n")
+            rows += 1
+            if report and rows % 10000 == 0: report(f"{rows} entries written")
+    return rows
+
+# --- CHANGE WATCHER ---
+class InotifyWatcher:
+    """Watches one directory through Linux inotify (via ctypes, no extra packages)."""
+    IN_MODIFY, IN_ATTRIB, IN_CLOSE_WRITE = 0x2, 0x4, 0x8
+    IN_MOVED_FROM, IN_MOVED_TO, IN_CREATE, IN_DELETE = 0x40, 0x80, 0x100, 0x200
+    IN_DELETE_SELF, IN_MOVE_SELF, IN_Q_OVERFLOW = 0x400, 0x800, 0x4000
+    MASK = 0xFCE   # all of the above except IN_Q_OVERFLOW, which is always reported
+
+    def __init__(self):
+        self._libc = ctypes.CDLL(ctypes.util.find_library("c") or "libc.so.6", use_errno=True)
+        self.fd = self._libc.inotify_init1(os.O_NONBLOCK | os.O_CLOEXEC)
+        if self.fd < 0: raise OSError(ctypes.get_errno(), "inotify_init1 failed")
+        self.path = self.wd = None
+
+    def fileno(self):
+        return self.fd
+
+    def watch(self, path):
+        if path == self.path: return
+        if self.wd is not None: self._libc.inotify_rm_watch(self.fd, self.wd)
+        wd = self._libc.inotify_add_watch(self.fd, os.fsencode(path), self.MASK)
+        self.path, self.wd = path, wd if wd >= 0 else None
+
+    def poll(self):
+        events = []
+        while True:
+            try: data = os.read(self.fd, 65536)
+            except BlockingIOError: break
+            pos = 0
+            while pos < len(data):
+                wd, mask, _, size = struct.unpack_from("iIII", data, pos)
+                name = os.fsdecode(data[pos + 16:pos + 16 + size].rstrip(b"\0"))
+                pos += 16 + size
+                if mask & (self.IN_Q_OVERFLOW | self.IN_DELETE_SELF | self.IN_MOVE_SELF): events.append(("rescan", ""))
+                # Events about the watched folder itself (IN_ATTRIB on it) carry no name
+                elif wd != self.wd or not name: continue
+                elif mask & (self.IN_CREATE | self.IN_MOVED_TO): events.append(("add", name))
+                elif mask & (self.IN_DELETE | self.IN_MOVED_FROM): events.append(("remove", name))
+                elif mask & (self.IN_MODIFY | self.IN_ATTRIB | self.IN_CLOSE_WRITE): events.append(("modify", name))
+        return events
+
+class PollingWatcher:
+    """Fallback watcher: relists only when the directory's mtime moved and
+    diffs against the previous listing. Content edits that leave the folder's
+    mtime alone are picked up on the next REFRESH."""
+    def __init__(self):
+        self.path, self._stamp, self._snap = None, None, {}
+
+    def fileno(self):
+        return None
+
+    def _take(self):
+        self._stamp = ListingCache._stamp(self.path)
+        dirs, files = scan_dir(self.path)
+        self._snap = {e.name: e for e in chain(dirs, files)}
+
+    def watch(self, path):
+        if path == self.path: return
+        self.path = path
+        try: self._take()
+        except OSError: self._snap = {}
+
+    def poll(self):
+        try:
+            if self.path is None or ListingCache._stamp(self.path) == self._stamp: return []
+            old = self._snap
+            self._take()
+        except OSError:
+            return [("rescan", "")]
+        events = [("remove", n) for n in old.keys() - self._snap.keys()]
+        events += [("add", n) for n in self._snap.keys() - old.keys()]
+        events += [("modify", n) for n in self._snap.keys() & old.keys() if self._snap[n] != old[n]]
+        return events
+
+def make_watcher():
+    """inotify on Linux, polling everywhere else (or if inotify is unavailable)."""
+    if sys.platform.startswith("linux"):
+        try: return InotifyWatcher()
+        except (OSError, AttributeError): pass
+    return PollingWatcher()
+
+# --- DUPLICATE FINDER ---
+EDGE_BYTES = 16 * 2**10   # partial hash reads this much from each end of a file
+
+def _edge_hash(path):
+    """Hash of the first and last EDGE_BYTES (the whole file up to 2 * EDGE_BYTES)."""
+    try:
+        h = hashlib.blake2b(digest_size=16)
+        with open(path, "rb") as f:
+            if f.seek(0, os.SEEK_END) <= 2 * EDGE_BYTES:
+                f.seek(0)
+                h.update(f.read())
+            else:
+                f.seek(0)
+                h.update(f.read(EDGE_BYTES))
+                f.seek(-EDGE_BYTES, os.SEEK_END)
+                h.update(f.read(EDGE_BYTES))
+        return path, h.hexdigest()
+    except OSError:
+        return path, None
+
+def _full_hash(path):
+    try: return path, file_hash(path, "blake2b")
+    except OSError: return path, None
+
+def find_duplicates(root, min_size=1, workers=None, report=None):
+    """Groups identical files below root in three stages: size, edge hash, full hash.
+
+    Only files still tied after a stage go on to the next, so most bytes of a
+    large media tree are never read. Hashing runs in a process pool. Hard
+    links to the same inode count once. Returns (groups, bytes read), groups
+    sorted by reclaimable space, each group [(path, size), ...].
+    """
+    say = report or (lambda text: None)
+    by_size, seen = {}, set()
+    for e in iter_entries(root):
+        if not e.is_file(follow_symlinks=False): continue
+        try: st = e.stat(follow_symlinks=False)
+        except OSError: continue
+        if st.st_size < min_size or (st.st_dev, st.st_ino) in seen: continue
+        seen.add((st.st_dev, st.st_ino))
+        by_size.setdefault(st.st_size, []).append(e.path)
+    sizes = {p: size for size, paths in by_size.items() if len(paths) > 1 for p in paths}
+    say(f"{len(seen)} files, {len(sizes)} share a size")
+
+    bytes_read = 0
+    with ProcessPoolExecutor(workers) as pool:
+        def regroup(paths, hasher, stage):
+            """Hashes paths and returns the groups still tied as [[path, ...]]."""
+            nonlocal bytes_read
+            out = {}
+            for i, (path, digest) in enumerate(pool.map(hasher, paths, chunksize=64), 1):
+                if digest is None: continue
+                size = sizes[path]
+                bytes_read += size if hasher is _full_hash else min(size, 2 * EDGE_BYTES)
+                out.setdefault((size, digest), []).append(path)
+                if i % 1000 == 0: say(f"{stage}: {i}/{len(paths)} files hashed")
+            return [g for g in out.values() if len(g) > 1]
+
+        tied = regroup(list(sizes), _edge_hash, "edge hash")
+        # Files up to 2 * EDGE_BYTES were hashed whole already
+        final = [g for g in tied if sizes[g[0]] <= 2 * EDGE_BYTES]
+        large = [p for g in tied if sizes[g[0]] > 2 * EDGE_BYTES for p in g]
+        if large: final += regroup(large, _full_hash, "full hash")
+    groups = [[(p, sizes[p]) for p in sorted(g)] for g in final]
+    groups.sort(key=lambda g: g[0][1] * (len(g) - 1), reverse=True)
+    return groups, bytes_read
+
+def dedupe(groups, mode):
+    """Replaces every copy but the first with a hard link ("link") or removes it ("delete")."""
+    done, errors = 0, []
+    for group in groups:
+        keep = group[0][0]
+        for path, _ in group[1:]:
+            try:
+                if mode == "link":
+                    tmp = path + ".pscli-link"
+                    os.link(keep, tmp)
+                    os.replace(tmp, path)
+                else:
+                    os.remove(path)
+                done += 1
+            except OSError as e:
+                errors.append((path, e))
+    return done, errors
+
+# --- ARCHIVES ---
+ARCHIVE_TYPES = {"zip": ".zip", "tar.gz": ".tar.gz", "tar.xz": ".tar.xz"}
+
+class ParallelGzipWriter:
+    """Write-only gzip stream compressed in 1 MiB blocks on a thread pool (pigz style).
+
+    Each block is raw-deflated with the previous 32 KB as dictionary and ends
+    in a sync flush, so the concatenated blocks form one valid deflate stream
+    that any gzip reader accepts. zlib releases the GIL while compressing.
+    """
+    def __init__(self, raw, workers=None, level=6, block=2**20):
+        self.raw, self.level, self.block = raw, level, block
+        self.workers = max(1, workers or os.cpu_count() or 2)
+        self._pool = ThreadPoolExecutor(self.workers)
+        self._pending = deque()
+        self._buf = bytearray()
+        self._tail = b""
+        self._crc = self._size = 0
+        raw.write(b"\x1f\x8b\x08\x00" + struct.pack("<I", int(time.time())) + b"\x00\xff")
+
+    @staticmethod
+    def _deflate(data, zdict, level, last):
+        c = zlib.compressobj(level, zlib.DEFLATED, -15, 9, zlib.Z_DEFAULT_STRATEGY, *([zdict] if zdict else []))
+        return c.compress(data) + c.flush(zlib.Z_FINISH if last else zlib.Z_SYNC_FLUSH)
+
+    def _submit(self, data, last=False):
+        self._pending.append(self._pool.submit(self._deflate, data, self._tail, self.level, last))
+        self._tail = data[-32768:]
+        while len(self._pending) > self.workers * 2:
+            self.raw.write(self._pending.popleft().result())
+
+    def write(self, data):
+        self._crc = zlib.crc32(data, self._crc)
+        self._size += len(data)
+        self._buf += data
+        while len(self._buf) >= self.block:
+            self._submit(bytes(self._buf[:self.block]))
+            del self._buf[:self.block]
+        return len(data)
+
+    def close(self):
+        if self._pool is None: return
+        self._submit(bytes(self._buf), last=True)
+        while self._pending: self.raw.write(self._pending.popleft().result())
+        self._pool.shutdown()
+        self._pool = None
+        self.raw.write(struct.pack("<II", self._crc, self._size & 0xFFFFFFFF))
+        self.raw.close()
+
+def _tree_bytes(root, skip=None):
+    total = 0
+    for e in iter_entries(root):
+        try:
+            if e.is_file(follow_symlinks=False) and os.path.abspath(e.path) != skip:
+                total += e.stat(follow_symlinks=False).st_size
+        except OSError: pass
+    return total
+
+def create_archive(src, target, kind, report=None, workers=None):
+    """Streams src (file or folder) into a zip, tar.gz or tar.xz archive.
+
+    Files are read and compressed entry by entry, never staged in memory;
+    tar.gz compression runs on all cores through ParallelGzipWriter.
+    report(done, total, bytes_per_second) follows the input bytes.
+    """
+    base = os.path.dirname(os.path.abspath(src))
+    skip = os.path.abspath(target)   # the archive may be written inside src
+    if os.path.isdir(src):
+        entries = chain([src], (e.path for e in iter_entries(src) if os.path.abspath(e.path) != skip))
+        total = _tree_bytes(src, skip)
+    else: entries, total = [src], os.path.getsize(src)
+    gz = None
+    if kind == "zip":
+        archive = zipfile.ZipFile(target, "w", zipfile.ZIP_DEFLATED, allowZip64=True)
+        add = archive.write
+    else:
+        if kind == "tar.gz":
+            gz = ParallelGzipWriter(open(target, "wb"), workers)
+            archive = tarfile.open(fileobj=gz, mode="w|")
+        else: archive = tarfile.open(target, "w:xz")
+        add = lambda path, arc: archive.add(path, arc, recursive=False)
+    done, started = 0, time.perf_counter()
+    try:
+        for path in entries:
+            add(path, os.path.relpath(path, base))
+            if os.path.isfile(path) and not os.path.islink(path):
+                done += os.path.getsize(path)
+                if report: report(done, total, done / max(time.perf_counter() - started, 1e-6))
+    finally:
+        archive.close()
+        if gz: gz.close()
+    return done
+
+def list_archive(path):
+    """Yields (name, size, is_dir) from the zip central directory or the tar headers.
+
+    A zip is listed without decompressing anything; a compressed tar has no
+    index, so its stream is decompressed but member data is never kept.
+    """
+    if zipfile.is_zipfile(path):
+        with zipfile.ZipFile(path) as zf:
+            for info in zf.infolist(): yield info.filename, info.file_size, info.is_dir()
+    else:
+        with tarfile.open(path, "r|*") as tf:
+            for member in tf: yield member.name, member.size, member.isdir()
+
+def _inside(target, name):
+    root = os.path.realpath(target)
+    dest = os.path.realpath(os.path.join(target, name))
+    return dest == root or dest.startswith(root + os.sep)
+
+def extract_archive(path, target, report=None):
+    """Extracts member by member, rejecting entries that would land outside target.
+
+    report(done, total, bytes_per_second) follows the archive bytes read.
+    Returns the number of members extracted.
+    """
+    os.makedirs(target, exist_ok=True)
+    total, started, count = os.path.getsize(path), time.perf_counter(), 0
+    with open(path, "rb") as raw:
+        if zipfile.is_zipfile(raw):
+            archive = zipfile.ZipFile(raw)
+            members = archive.infolist()
+            extract = lambda m: archive.extract(m, target)
+            name = lambda m: m.filename
+            is_link = lambda m: False
+        else:
+            raw.seek(0)
+            archive = tarfile.open(fileobj=raw, mode="r|*")
+            members = archive
+            if hasattr(tarfile, "data_filter"): extract = lambda m: archive.extract(m, target, filter="data")
+            else: extract = lambda m: archive.extract(m, target)
+            name = lambda m: m.name
+            is_link = lambda m: (m.issym() or m.islnk()) and not hasattr(tarfile, "data_filter")
+        with archive:
+            for member in members:
+                if not _inside(target, name(member)) or is_link(member):
+                    raise OSError(f"Unsafe entry in archive: {name(member)}")
+                extract(member)
+                count += 1
+                if report: report(raw.tell(), total, raw.tell() / max(time.perf_counter() - started, 1e-6))
+    return count
+
+# --- BACKGROUND JOBS ---
+class JobCancelled(Exception):
+    pass
+
+class Job:
+    """One queued operation. Engines report through job.report(), which also
+    raises JobCancelled once the user has cancelled the job."""
+    def __init__(self, name, touched=()):
+        self.name, self.touched = name, touched
+        self.status, self.progress, self.result = "queued", "", ""
+        self.output = []
+        self.cancel = threading.Event()
+        self.notified = False
+
+    def report(self, progress):
+        if self.cancel.is_set(): raise JobCancelled("Cancelled.")
+        self.progress = progress if isinstance(progress, str) else progress.line()
+
+    def report_file(self, done, total, bps):
+        self.report(f"{done * 100 / max(total, 1):5.1f}%  {_fmt_size(done)} / {_fmt_size(total)}  {bps / 2**20:.1f} MB/s")
+
+class JobManager:
+    """Thread-pool backed queue of long operations running behind the menu."""
+    def __init__(self, workers=2):
+        self.jobs = []
+        self._pool = ThreadPoolExecutor(workers)
+
+    def submit(self, name, func, touched=()):
+        job = Job(name, touched)
+        self.jobs.append(job)
+        self._pool.submit(self._run, job, func)
+        return job
+
+    def _run(self, job, func):
+        if job.cancel.is_set():
+            job.status = "cancelled"
+            return
+        job.status = "running"
+        try:
+            job.result = func(job)
+            job.status = "done"
+        except JobCancelled:
+            job.status = "cancelled"
+        except Exception as e:
+            job.status, job.result = "failed", f"{R} [!] ERROR: {e}{RESET}"
+
+    def active(self):
+        return [j for j in self.jobs if j.status in ("queued", "running")]
+
+    def pop_finished(self):
+        """Returns finished jobs that have not been announced yet."""
+        finished = [j for j in self.jobs if j.status not in ("queued", "running") and not j.notified]
+        for j in finished: j.notified = True
+        return finished
+
+    def cancel_all(self):
+        for j in self.active(): j.cancel.set()
+
+# --- BENCHMARKS (python "CMD File Manager Cli v1.5.0.py" --bench NAME) ---
+def _timed(func, *args):
+    start = time.perf_counter()
+    func(*args)
+    return time.perf_counter() - start
+
+def benchmark_listing(count=100_000):
+    """Compares scan_dir with the legacy listing on a synthetic flat tree."""
+    with tempfile.TemporaryDirectory(prefix="pscli_bench_") as root:
+        print(f" {Y}Creating {count} files in {root}...{RESET}")
+        for i in range(count):
+            open(os.path.join(root, f"file_{i:07d}.txt"), "wb").close()
+        for i in range(count // 100):
+            os.mkdir(os.path.join(root, f"dir_{i:05d}"))
+        legacy = min(_timed(_legacy_scan_dir, root) for _ in range(3))
+        fast = min(_timed(scan_dir, root) for _ in range(3))
+        print(f" Legacy listdir+isdir/isfile: {legacy:8.3f} s")
+        print(f" scandir engine:              {fast:8.3f} s  ({legacy / fast:.1f}x)")
+
+def _make_tree(root, files, size):
+    chunk = os.urandom(min(size, 2**20))
+    for i in range(files):
+        sub = os.path.join(root, f"d{i % 16:02d}")
+        os.makedirs(sub, exist_ok=True)
+        with open(os.path.join(sub, f"f{i:06d}.bin"), "wb") as f:
+            for _ in range(max(1, size // len(chunk))): f.write(chunk)
+
+def benchmark_copy():
+    """Compares CopyEngine with shutil.copytree on small-file and large-file trees."""
+    workers = COPY_WORKERS
+    cases = [("many small files (5000 x 4 KB)", 5000, 4 * 2**10),
+             ("few large files (4 x 64 MB)", 4, 64 * 2**20)]
+    for label, files, size in cases:
+        with tempfile.TemporaryDirectory(prefix="pscli_bench_") as root:
+            src = os.path.join(root, "src")
+            _make_tree(src, files, size)
+            serial = _timed(shutil.copytree, src, os.path.join(root, "a"))
+            engine = CopyEngine(workers, report=None)
+            parallel = _timed(engine.copy_tree, src, os.path.join(root, "b"))
+            print(f" {Y}{label}{RESET}")
+            print(f"   shutil.copytree:          {serial:8.3f} s")
+            print(f"   CopyEngine ({workers:2d} workers): {parallel:8.3f} s  ({serial / parallel:.1f}x)")
+
+def benchmark_delete(files=50_000):
+    """Compares DeleteEngine with shutil.rmtree on a wide tree of empty files."""
+    def build(root):
+        for i in range(files):
+            sub = os.path.join(root, f"pkg{i // 100:04d}", "lib")
+            if i % 100 == 0: os.makedirs(sub)
+            open(os.path.join(sub, f"m{i:06d}.js"), "wb").close()
+    with tempfile.TemporaryDirectory(prefix="pscli_bench_") as root:
+        print(f" {Y}Deleting {files} files in {files // 50} folders{RESET}")
+        build(os.path.join(root, "a"))
+        serial = _timed(shutil.rmtree, os.path.join(root, "a"))
+        build(os.path.join(root, "b"))
+        engine = DeleteEngine(report=None)
+        parallel = _timed(engine.delete_tree, os.path.join(root, "b"))
+        print(f"   shutil.rmtree:              {serial:8.3f} s  ({files / serial:8.0f} files/s)")
+        print(f"   DeleteEngine ({engine.workers:2d} workers): {parallel:8.3f} s  ({files / parallel:8.0f} files/s)  ({serial / parallel:.1f}x)")
+
+BENCHMARKS = {
+    "listing": benchmark_listing,
+    "copy": benchmark_copy,
+    "delete": benchmark_delete,
+}
+
 class FileManager:
     def __init__(self):
         self.msg = ""
+        self.cache = ListingCache()
+        self.copy_workers = COPY_WORKERS
+        self.du = DiskUsage()
+        self.view_dir, self.offset = None, 0
+        self.jobs = JobManager()
+        self.watcher = make_watcher()
         self.save_path = Path.home() / ".polsoft" / "psCLI" / "FileList"
         self.save_path.mkdir(parents=True, exist_ok=True)
         
@@ -32,36 +1553,65 @@ class FileManager:
         os.system('cls' if platform.system() == 'Windows' else 'clear')
 
     def get_dir_content(self):
-        try:
-            items = sorted(os.listdir('.'))
-            dirs = [d for d in items if os.path.isdir(d)]
-            files = [f for f in items if os.path.isfile(f)]
-            return dirs, files
-        except Exception:
-            return [], []
+        try: return self.cache.get('.')
+        except Exception: return [], []
+
+    def _rows(self, dirs, files):
+        """Number of listing rows, counting the separator between dirs and files."""
+        return len(dirs) + len(files) + (1 if dirs and files else 0)
+
+    def _format_row(self, dirs, files, i):
+        """Formats row i of the listing without touching any other row."""
+        if i < len(dirs):
+            name = dirs[i].name
+            display_name = (name[:85] + '...') if len(name) > 85 else name
+            padding = 94 - (2 + 5 + 2 + len(display_name))
+            return f"{B} │{RESET}  {G}[DIR]{RESET}  {display_name}" + " " * padding + f"{B}│{RESET}"
+        if dirs and files:
+            if i == len(dirs): return f"{B} ├" + "─" * 94 + f"┤{RESET}"
+            i -= 1
+        name = files[i - len(dirs)].name
+        display_name = (name[:85] + '...') if len(name) > 85 else name
+        padding = 94 - (10 + len(display_name))
+        return f"{B} │{RESET}          {display_name}" + " " * padding + f"{B}│{RESET}"
+
+    def page_size(self):
+        """Listing rows that fit on screen above the menu."""
+        return max(5, shutil.get_terminal_size((105, 50)).lines - 19)
+
+    def page(self, step):
+        self.offset += step * self.page_size()
+
+    def jump_to(self, prefix):
+        """Scrolls the view to the first entry whose name starts with prefix."""
+        dirs, files = self.get_dir_content()
+        prefix = prefix.lower()
+        for i, e in enumerate(chain(dirs, files)):
+            if e.name.lower().startswith(prefix):
+                self.view_dir = os.getcwd()
+                self.offset = i + (1 if dirs and files and i >= len(dirs) else 0)
+                return
+        self.msg = f"{Y} [i] No entry starting with '{prefix}'.{RESET}"
 
     def draw_menu(self):
         self.clear_screen()
         curr_dir = os.getcwd()
         dirs, files = self.get_dir_content()
+        if curr_dir != self.view_dir:
+            self.view_dir, self.offset = curr_dir, 0
 
-        print(f"\n {Y}DIRECTORY CONTENT:{RESET}  {B}[{curr_dir}]{RESET}")
-        print(f"{B} ┌" + "─" * 94 + f"┐{RESET}")
-        
-        for d in dirs:
-            display_name = (d[:85] + '...') if len(d) > 85 else d
-            padding = 94 - (2 + 5 + 2 + len(display_name))
-            print(f"{B} │{RESET}  {G}[DIR]{RESET}  {display_name}" + " " * padding + f"{B}│{RESET}")
-        
-        if dirs and files:
-            print(f"{B} ├" + "─" * 94 + f"┤{RESET}")
-        
-        for f in files:
-            display_name = (f[:85] + '...') if len(f) > 85 else f
-            padding = 94 - (10 + len(display_name))
-            print(f"{B} │{RESET}          {display_name}" + " " * padding + f"{B}│{RESET}")
-            
-        print(f"{B} └" + "─" * 94 + f"┘{RESET}")
+        # Viewport: only the visible window is formatted, then written at once
+        total, height = self._rows(dirs, files), self.page_size()
+        self.offset = max(0, min(self.offset, total - height))
+        end = min(total, self.offset + height)
+        active = self.jobs.active()
+        jobs_note = f"  {Y}[{len(active)} job(s) running - J]{RESET}" if active else ""
+        out = [f"\n {Y}DIRECTORY CONTENT:{RESET}  {B}[{curr_dir}]{RESET}{jobs_note}", f"{B} ┌" + "─" * 94 + f"┐{RESET}"]
+        out.extend(self._format_row(dirs, files, i) for i in range(self.offset, end))
+        out.append(f"{B} └" + "─" * 94 + f"┘{RESET}")
+        if total > height:
+            out.append(f"  {Y}rows {self.offset + 1}-{end} of {total}{RESET}  (N/P: page, /x: jump)")
+        sys.stdout.write("\n".join(out) + "\n")
 
         header_text = "CMD File Manager Cli"
         margin = (95 - len(header_text)) // 2
@@ -74,18 +1624,25 @@ class FileManager:
         print(f"{B}║{RESET}  [5]  NEW FILE        [6]  NEW FOLDER       [7]  DELETE FILE      [8]  DELETE FOLDER          {B}║{RESET}")
         print(f"{B}║{RESET}  [9]  RENAME          [10] COPY (SHUTIL)    [11] MOVE             [12] SAVE LIST              {B}║{RESET}")
         print(f"{B}║{RESET}  [13] BACKUP (MIRROR) [14] SEARCH           [15] OPEN SAVES       [16] HELP                   {B}║{RESET}")
-        print(f"{B}║{RESET}  [17] ABOUT           [18] EXIT                                                               {B}║{RESET}")
+        print(f"{B}║{RESET}  [17] ABOUT           [18] EXIT             [N/P] PAGE DN/UP      [/x] JUMP TO NAME           {B}║{RESET}")
+        print(f"{B}║{RESET}  [J]  JOBS            [W]  AUTO-REFRESH    [19] DUPLICATES      [20] ARCHIVE                  {B}║{RESET}")
         print(f"{B}╚═══════════════════════════════════════════════════════════════════════════════════════════════╝{RESET}\n")
         
+        for job in self.jobs.pop_finished():
+            self.cache.invalidate(*job.touched)
+            note = job.result if job.status != "cancelled" else f"{Y} [i] Cancelled.{RESET}"
+            self.msg += f"\n{Y} [JOB]{RESET} {job.name}:\n{note}"
         if self.msg:
-            print(self.msg)
+            print(self.msg.lstrip("\n"))
             self.msg = ""
 
     def run(self):
         while True:
             self.draw_menu()
-            choice = input(f"{B} CMD CLI > {RESET}Select option: ").strip()
-            if choice == "1": continue
+            choice = self.read_choice(f"{B} CMD CLI > {RESET}Select option: ")
+            if choice is None: continue
+            choice = choice.strip()
+            if choice == "1": self.cache.invalidate(os.getcwd())
             elif choice == "2": self.enter_dir()
             elif choice == "3": os.chdir("..")
             elif choice == "4": self.disk_info()
@@ -102,9 +1659,44 @@ class FileManager:
             elif choice == "15": self.open_saves()
             elif choice == "16": self.show_help()
             elif choice == "17": self.show_about()
-            elif choice == "18": break
+            elif choice == "18":
+                if not self.jobs.active() or input(f"{Y} [?] Jobs still running. Cancel them and exit? (y/N): {RESET}").strip().lower() == "y":
+                    self.jobs.cancel_all()
+                    break
+            elif choice.lower() == "j": self.show_jobs()
+            elif choice.lower() == "w": self.toggle_watcher()
+            elif choice == "19": self.find_dupes()
+            elif choice == "20": self.archive()
+            elif choice.lower() == "n": self.page(1)
+            elif choice.lower() == "p": self.page(-1)
+            elif choice.startswith("/") and len(choice) > 1: self.jump_to(choice[1:])
             else: self.msg = f"{R} [!] Invalid choice!{RESET}"
 
+    def read_choice(self, prompt):
+        """input() that returns None early when the watcher reports changes to the view.
+
+        Until a key is pressed the directory is watched (once a second on
+        Windows); matching events patch the cached listing and force a redraw.
+        """
+        if not (self.watcher and sys.stdin.isatty()): return input(prompt)
+        self.watcher.watch(os.getcwd())
+        sys.stdout.write(prompt)
+        sys.stdout.flush()
+        while True:
+            if os.name == "nt":
+                for _ in range(20):
+                    if msvcrt.kbhit(): return input()
+                    time.sleep(0.05)
+            else:
+                fds = [sys.stdin] + ([self.watcher] if self.watcher.fileno() is not None else [])
+                if sys.stdin in select.select(fds, [], [], 1.0)[0]: return input()
+            if self.cache.apply(self.watcher.path, self.watcher.poll()): return None
+
+    def toggle_watcher(self):
+        self.watcher = None if self.watcher else make_watcher()
+        state = f"ON ({type(self.watcher).__name__})" if self.watcher else "OFF"
+        self.msg = f"{G} [+] Auto-refresh {state}.{RESET}"
+
     def enter_dir(self):
         folder = input(" [?] Folder name: ")
         try: os.chdir(folder)
@@ -119,69 +1711,188 @@ class FileManager:
             print(f" Total:     {usage.total // (2**30)} GB")
             print(f" Used:      {usage.used // (2**30)} GB")
             print(f" Free:      {usage.free // (2**30)} GB")
-            input(f"\n{G}Press [ENTER] to return...{RESET}")
+            choice = input(f"\n [?] Analyze folder sizes here? [y] yes  [r] full rescan  [ENTER] return: ").strip().lower()
+            if choice in ("y", "r"): self.show_usage(full=choice == "r")
         except Exception as e: print(f"{R} [!] ERROR: {e}{RESET}")
 
+    def show_usage(self, full=False, top_n=25):
+        if full: self.du.clear()
+        print(f"\n {Y}Scanning {os.getcwd()} with {self.copy_workers} workers...{RESET}")
+        start = time.perf_counter()
+        rows = self.du.breakdown('.', self.copy_workers)
+        total = sum(r[1] for r in rows) or 1
+        print(f"\n {Y} [ TOP {min(top_n, len(rows))} OF {len(rows)} ]{RESET}  total {_fmt_size(total)}, {sum(r[2] for r in rows)} files, {time.perf_counter() - start:.2f} s")
+        for name, size, files, is_dir in rows[:top_n]:
+            bar = "█" * round(30 * size / total)
+            label = f"{G}[DIR]{RESET} " if is_dir else "      "
+            print(f" {_fmt_size(size):>10}  {bar:<30}  {label}{name[:40]:<40}  {Y}{files} file(s){RESET}")
+        input(f"\n{G}Press [ENTER] to return...{RESET}")
+
     def make_file(self):
         name = input(" [+] New file name: ")
-        try: Path(name).touch(); self.msg = f"{G} [+] Created successfully.{RESET}"
+        try: Path(name).touch(); self.cache.invalidate(name); self.msg = f"{G} [+] Created successfully.{RESET}"
         except Exception as e: self.msg = f"{R} [!] ERROR: {e}{RESET}"
 
     def make_dir(self):
         name = input(" [+] New folder name: ")
-        try: os.makedirs(name, exist_ok=True); self.msg = f"{G} [+] Folder created.{RESET}"
+        try: os.makedirs(name, exist_ok=True); self.cache.invalidate(name); self.msg = f"{G} [+] Folder created.{RESET}"
         except Exception as e: self.msg = f"{R} [!] ERROR: {e}{RESET}"
 
     def delete_file(self):
         name = input(" [!] File to delete: ")
-        try: os.remove(name); self.msg = f"{G} [+] Deleted.{RESET}"
+        try: os.remove(name); self.cache.invalidate(name); self.msg = f"{G} [+] Deleted.{RESET}"
         except Exception as e: self.msg = f"{R} [!] ERROR: {e}{RESET}"
 
-    def delete_folder(self):
-        name = input(" [!] Folder to delete: ")
-        try: shutil.rmtree(name); self.msg = f"{G} [+] Directory deleted.{RESET}"
+    def _dispatch(self, name, work, touched=(), ask=True):
+        """Runs work(job) now (job=None) or, if the user asks, as a background job.
+
+        work returns the status line for self.msg; paths must be absolute
+        because the user may change directory while a job runs.
+        """
+        if ask and input(" [?] Run in background? (y/N): ").strip().lower() == "y":
+            self.jobs.submit(name, work, touched)
+            self.msg = f"{Y} [i] Queued: {name} - see [J] JOBS.{RESET}"
+            return
+        try: self.msg = work(None)
+        except (KeyboardInterrupt, JobCancelled) as e: self.msg = f"{Y} [i] {str(e) or 'Interrupted.'}{RESET}"
         except Exception as e: self.msg = f"{R} [!] ERROR: {e}{RESET}"
+        self.cache.invalidate(*touched)
+
+    def delete_folder(self):
+        name = os.path.abspath(input(" [!] Folder to delete: "))
+        def work(job):
+            progress = DeleteEngine(self.copy_workers, report=job.report if job else print_progress).delete_tree(name)
+            if progress.errors:
+                path, err = progress.errors[0]
+                raise OSError(f"{len(progress.errors)} entries not removed, first: {path}: {err}")
+            return f"{G} [+] Directory deleted ({progress.done} entries).{RESET}"
+        self._dispatch(f"delete {name}", work, (name,))
 
     def rename_item(self):
         old = input(" [!] Current name: ")
         new = input(" [!] New name: ")
-        try: os.rename(old, new); self.msg = f"{G} [+] Name changed.{RESET}"
+        try: os.rename(old, new); self.cache.invalidate(old, new); self.msg = f"{G} [+] Name changed.{RESET}"
         except Exception as e: self.msg = f"{R} [!] ERROR: {e}{RESET}"
 
     def copy_item(self):
-        src, dst = input(" [?] Source: "), input(" [?] Destination: ")
-        try:
-            if os.path.isdir(src): shutil.copytree(src, dst, dirs_exist_ok=True)
+        src, dst = map(os.path.abspath, (input(" [?] Source: "), input(" [?] Destination: ")))
+        is_dir = os.path.isdir(src)
+        large = not is_dir and os.path.isfile(src) and os.path.getsize(src) >= LARGE_FILE_THRESHOLD
+        def work(job):
+            if is_dir: self._copy_tree(src, dst, job)
+            elif large: self._copy_large(src, dst, job)
             else: shutil.copy2(src, dst)
-            self.msg = f"{G} [+] Copied.{RESET}"
-        except Exception as e: self.msg = f"{R} [!] ERROR: {e}{RESET}"
+            return f"{G} [+] Copied.{RESET}"
+        self._dispatch(f"copy {src} -> {dst}", work, (dst,), ask=is_dir or large)
+
+    def _copy_tree(self, src, dst, job=None):
+        """Copies a directory tree with the parallel engine; per-file errors raise at the end."""
+        if not job: print(f"\n {Y}Copying with {self.copy_workers} workers...{RESET}")
+        progress = CopyEngine(self.copy_workers, report=job.report if job else print_progress).copy_tree(src, dst)
+        if progress.errors:
+            path, err = progress.errors[0]
+            raise OSError(f"{len(progress.errors)} file(s) failed, first: {path}: {err}")
+
+    def _copy_large(self, src, dst, job=None):
+        if job:
+            copy_large_file(src, dst, job.report_file)
+            return
+        print(f"\n {Y}Large file: resumable copy with checksum verification...{RESET}")
+        try: copy_large_file(src, dst, print_file_progress)
+        except KeyboardInterrupt: raise JobCancelled("Copy interrupted - repeat it to resume.")
+        print()
 
     def move_item(self):
         src, dst = input(" [?] Source: "), input(" [?] Destination: ")
-        try: shutil.move(src, dst); self.msg = f"{G} [+] Moved.{RESET}"
+        try:
+            target_dir = dst if os.path.isdir(dst) else os.path.dirname(os.path.abspath(dst))
+            if (os.path.isfile(src) and os.path.getsize(src) >= LARGE_FILE_THRESHOLD
+                    and os.stat(src).st_dev != os.stat(target_dir).st_dev):
+                self._copy_large(src, dst)
+                os.remove(src)
+            else: shutil.move(src, dst)
+            self.cache.invalidate(src, dst); self.msg = f"{G} [+] Moved.{RESET}"
+        except (KeyboardInterrupt, JobCancelled): self.msg = f"{Y} [i] Move interrupted - repeat it to resume the copy.{RESET}"
         except Exception as e: self.msg = f"{R} [!] ERROR: {e}{RESET}"
 
     def save_list(self):
         folder_name = os.path.basename(os.getcwd()) or "DRIVE"
         timestamp = datetime.now().strftime("%Y-%m-%d_%H%M%S")
-        filename = self.save_path / f"{folder_name}_{timestamp}.txt"
-        try:
-            with open(filename, "w", encoding="utf-8") as f:
-                f.write(f"REPORT - {datetime.now()}\n\n")
-                for item in os.listdir('.'): f.write(f"{item}\n")
-            self.msg = f"{G} [+] List saved.{RESET}"
-        except Exception as e: self.msg = f"{R} [!] ERROR: {e}{RESET}"
+        print(f" {Y}[1]{RESET} TXT names (this folder)  {Y}[2]{RESET} CSV (recursive)  {Y}[3]{RESET} JSON Lines (recursive)")
+        fmt = {"2": "csv", "3": "jsonl"}.get(input(" [?] Format: ").strip(), "txt")
+        if fmt == "txt":
+            filename = self.save_path / f"{folder_name}_{timestamp}.txt"
+            try:
+                with open(filename, "w", encoding="utf-8") as f:
+                    f.write(f"REPORT - {datetime.now()}\n\n")
+                    for item in os.listdir('.'): f.write(f"{item}\n")
+                self.cache.invalidate(filename)
+                self.msg = f"{G} [+] List saved.{RESET}"
+            except Exception as e: self.msg = f"{R} [!] ERROR: {e}{RESET}"
+            return
+        gz = ".gz" if input(" [?] Compress with gzip? (y/N): ").strip().lower() == "y" else ""
+        filename = self.save_path / f"{folder_name}_{timestamp}.{fmt}{gz}"
+        root = os.getcwd()
+        def work(job):
+            rows = export_listing(root, filename, fmt, job.report if job else None)
+            return f"{G} [+] List saved: {rows} entries -> {filename.name}{RESET}"
+        self._dispatch(f"export {root} -> {filename.name}", work, (str(filename),))
 
     def search(self):
-        query = input(" [?] Search phrase: ")
-        print(f"\n {Y}RESULTS:{RESET}")
+        mode = input(" [?] Search in - [1] Names (default)  [2] File contents: ").strip()
+        if mode == "2": return self.search_content()
+        query = input(" [?] Search phrase (:reindex to update the index, :rebuild to recreate it): ").strip()
+        try:
+            index = FilenameIndex('.')
+            if query in (":reindex", ":rebuild") or index.is_empty():
+                print(f" {Y}Indexing {index.root}...{RESET}")
+                start = time.perf_counter()
+                seen, rescanned = index.update(full=query == ":rebuild")
+                self.msg = f"{G} [+] Index updated: {seen} folders, {rescanned} rescanned in {time.perf_counter() - start:.1f} s.{RESET}"
+                if query.startswith(":"): return
+            start = time.perf_counter()
+            results = list(index.search(query, limit=1000))
+            elapsed = time.perf_counter() - start
+        except Exception as e:
+            self.msg = f"{R} [!] ERROR: {e}{RESET}"
+            return
+        print(f"\n {Y}RESULTS:{RESET} {len(results)} in {elapsed * 1000:.0f} ms (index may be stale, use :reindex)")
         print(f"{B} ┌" + "─" * 94 + f"┐{RESET}")
-        for path in Path('.').rglob(f"*{query}*"):
+        for path in results:
             line = str(path)[:90]
             print(f"{B} │{RESET}  {line:<91}{B}│{RESET}")
         print(f"{B} └" + "─" * 94 + f"┘{RESET}")
         input(f"\n{G}Back [ENTER]...{RESET}")
 
+    def search_content(self):
+        text = input(" [?] Text to find: ")
+        if not text: return
+        if input(" [?] Run in background? (y/N): ").strip().lower() == "y":
+            root = os.getcwd()
+            def work(job):
+                search = ContentSearch(root, text, self.copy_workers)
+                search.cancel = job.cancel
+                for path, lineno, line in search.start():
+                    if len(job.output) < 10000: job.output.append(f"{os.path.relpath(path, root)}:{lineno}: {line[:120]}")
+                    job.progress = f"{len(job.output)} match(es), {search.files} file(s) read"
+                if job.cancel.is_set(): raise JobCancelled()
+                return f"{G} [+] {len(job.output)} match(es) for '{text}' - view with [J] JOBS.{RESET}"
+            self.jobs.submit(f"grep '{text}' in {root}", work)
+            self.msg = f"{Y} [i] Queued content search - see [J] JOBS.{RESET}"
+            return
+        search = ContentSearch('.', text, self.copy_workers).start()
+        print(f"\n {Y}MATCHES{RESET} (Ctrl+C to cancel):")
+        found = 0
+        try:
+            for path, lineno, line in search:
+                found += 1
+                print(f" {G}{os.path.relpath(path)}{RESET}:{Y}{lineno}{RESET}: {line[:120]}")
+        except KeyboardInterrupt:
+            search.cancel.set()
+            print(f"\n {R}[!] Search cancelled.{RESET}")
+        print(f"\n {found} match(es) in {search.files} text file(s), {search.skipped} binary/unreadable skipped.")
+        input(f"\n{G}Back [ENTER]...{RESET}")
+
     def open_saves(self):
         try:
             if platform.system() == "Windows": os.startfile(self.save_path)
@@ -189,9 +1900,130 @@ class FileManager:
         except Exception: pass
 
     def backup(self):
-        src, dst = input(" [?] Source: "), input(" [?] Destination: ")
-        try: shutil.copytree(src, dst, dirs_exist_ok=True); self.msg = f"{G} [+] Backup OK.{RESET}"
-        except Exception as e: self.msg = f"{R} [!] ERROR: {e}{RESET}"
+        src, dst = map(os.path.abspath, (input(" [?] Source: "), input(" [?] Destination: ")))
+        print(f" {Y}[1]{RESET} Full mirror  {Y}[2]{RESET} Incremental  {Y}[3]{RESET} Snapshot (dedup store)  {Y}[4]{RESET} Restore snapshot  {Y}[5]{RESET} Sync (block delta)")
+        mode = input(" [?] Mode: ").strip()
+        failed = lambda errors: f"\n{R} [!] {len(errors)} file(s) failed, first: {errors[0][0]}: {errors[0][1]}{RESET}" if errors else ""
+        if mode == "3":
+            def work(job):
+                name, total, reused, new, errors = SnapshotStore(dst).snapshot(src, self.copy_workers, job.report if job else print_progress)
+                return f"{G} [+] Snapshot {name}: {total} files, {reused} unchanged, {new} new chunks.{RESET}" + failed(errors)
+        elif mode == "4":
+            store = SnapshotStore(src)
+            names = store.list_snapshots()
+            if not names:
+                self.msg = f"{R} [!] ERROR: No snapshots in {src}{RESET}"
+                return
+            print("\n".join(f"   {n}" for n in names[-10:]))
+            name = input(f" [?] Snapshot [{names[-1]}]: ").strip() or names[-1]
+            def work(job):
+                total, errors = store.restore(name, dst, self.copy_workers, job.report if job else print_progress)
+                return f"{G} [+] Restored {total - len(errors)} files from {name}.{RESET}" + failed(errors)
+        elif mode == "5":
+            def work(job):
+                engine = CopyEngine(self.copy_workers, report=job.report if job else print_progress)
+                copied, delta, written, blocks, skipped, errors = sync_tree(src, dst, engine)
+                return (f"{G} [+] Sync OK. Copied {copied}, delta-updated {delta} ({written}/{blocks} blocks rewritten), "
+                        f"unchanged {skipped}.{RESET}") + failed(errors)
+        elif mode == "2":
+            delete = input(" [?] Delete files removed from source? (y/N): ").strip().lower() == "y"
+            verify = input(" [?] Compare content hashes of changed files? (y/N): ").strip().lower() == "y"
+            def work(job):
+                engine = CopyEngine(self.copy_workers, report=job.report if job else print_progress)
+                copied, skipped, deleted, errors = incremental_mirror(src, dst, delete, verify, engine)
+                return f"{G} [+] Backup OK. Copied {copied}, unchanged {skipped}, deleted {deleted}.{RESET}" + failed(errors)
+        else:
+            def work(job):
+                self._copy_tree(src, dst, job)
+                return f"{G} [+] Backup OK.{RESET}"
+        self._dispatch(f"backup {src} -> {dst}", work, (dst,))
+
+    def find_dupes(self):
+        root = os.getcwd()
+        try: min_size = int(input(" [?] Ignore files smaller than (bytes) [1]: ").strip() or 1)
+        except ValueError: min_size = 1
+        print(f"\n {Y}Scanning {root}: size -> edge hash -> full hash...{RESET}")
+        start = time.perf_counter()
+        try: groups, bytes_read = find_duplicates(root, min_size, report=lambda text: print(f"   {text}"))
+        except Exception as e:
+            self.msg = f"{R} [!] ERROR: {e}{RESET}"
+            return
+        reclaim = sum(g[0][1] * (len(g) - 1) for g in groups)
+        print(f"\n {Y}DUPLICATES:{RESET} {len(groups)} group(s), {_fmt_size(reclaim)} reclaimable "
+              f"({_fmt_size(bytes_read)} read in {time.perf_counter() - start:.1f} s)")
+        for group in groups[:20]:
+            print(f"\n  {_fmt_size(group[0][1])} x {len(group)}")
+            for i, (path, _) in enumerate(group):
+                print(f"   {G if i == 0 else R}{'keep' if i == 0 else 'dup '}{RESET}  {os.path.relpath(path, root)}")
+        if len(groups) > 20: print(f"\n  ... and {len(groups) - 20} more group(s)")
+        if not groups:
+            input(f"\n{G}Back [ENTER]...{RESET}")
+            return
+        action = input(f"\n [?] [h] hard-link duplicates  [d] delete duplicates  [ENTER] keep all: ").strip().lower()
+        if action not in ("h", "d"): return
+        if input(f"{R} [!] This changes {sum(len(g) - 1 for g in groups)} file(s). Type YES to confirm: {RESET}").strip() != "YES": return
+        done, errors = dedupe(groups, "link" if action == "h" else "delete")
+        self.cache.clear()
+        self.msg = f"{G} [+] {done} duplicate(s) {'hard-linked' if action == 'h' else 'deleted'}, {_fmt_size(reclaim)} reclaimed.{RESET}"
+        if errors: self.msg += f"\n{R} [!] {len(errors)} failed, first: {errors[0][0]}: {errors[0][1]}{RESET}"
+
+    def archive(self):
+        print(f" {Y}[1]{RESET} Create  {Y}[2]{RESET} Extract  {Y}[3]{RESET} List contents")
+        action = input(" [?] Action: ").strip()
+        if action == "1":
+            src = os.path.abspath(input(" [?] File or folder to pack: "))
+            kind = input(" [?] Format - zip / tar.gz / tar.xz [zip]: ").strip().lower() or "zip"
+            if kind not in ARCHIVE_TYPES:
+                self.msg = f"{R} [!] Unknown format: {kind}{RESET}"
+                return
+            target = os.path.abspath(input(f" [?] Archive name [{os.path.basename(src)}{ARCHIVE_TYPES[kind]}]: ").strip()
+                                     or os.path.basename(src) + ARCHIVE_TYPES[kind])
+            def work(job):
+                size = create_archive(src, target, kind, job.report_file if job else print_file_progress, self.copy_workers)
+                if not job: print()
+                return f"{G} [+] Archive created: {os.path.basename(target)} ({_fmt_size(size)} in, {_fmt_size(os.path.getsize(target))} out).{RESET}"
+            self._dispatch(f"pack {src} -> {target}", work, (target,))
+        elif action == "2":
+            path = os.path.abspath(input(" [?] Archive: "))
+            target = os.path.abspath(input(" [?] Extract to [.]: ").strip() or ".")
+            def work(job):
+                count = extract_archive(path, target, job.report_file if job else print_file_progress)
+                if not job: print()
+                return f"{G} [+] Extracted {count} entries to {target}.{RESET}"
+            self._dispatch(f"unpack {path} -> {target}", work, (target,))
+        elif action == "3":
+            path = input(" [?] Archive: ")
+            try:
+                print(f"{B} ┌" + "─" * 94 + f"┐{RESET}")
+                count = total = 0
+                for name, size, is_dir in list_archive(path):
+                    count, total = count + 1, total + size
+                    label = f"     {G}[DIR]{RESET}" if is_dir else f"{_fmt_size(size):>10}"
+                    print(f"{B} │{RESET} {label}  {name[:78]:<81}{B}│{RESET}")
+                print(f"{B} └" + "─" * 94 + f"┘{RESET}")
+                print(f" {count} entries, {_fmt_size(total)} uncompressed")
+                input(f"\n{G}Back [ENTER]...{RESET}")
+            except Exception as e: self.msg = f"{R} [!] ERROR: {e}{RESET}"
+
+    def show_jobs(self):
+        while True:
+            self.clear_screen()
+            print(f"\n{B}  ═══ BACKGROUND JOBS ═══{RESET}\n")
+            if not self.jobs.jobs: print("  No jobs yet.")
+            for i, job in enumerate(self.jobs.jobs, 1):
+                color = {"done": G, "failed": R}.get(job.status, Y)
+                print(f"  [{i}] {color}{job.status:<9}{RESET} {job.name[:70]}")
+                if job.status == "running" and job.progress: print(f"        {job.progress}")
+            choice = input(f"\n [?] [c N] cancel  [v N] view output  [ENTER] back: ").strip().lower().split()
+            if not choice: return
+            try: job = self.jobs.jobs[int(choice[1]) - 1]
+            except (IndexError, ValueError): continue
+            if choice[0] == "c": job.cancel.set()
+            elif choice[0] == "v":
+                print(f"\n {Y}{job.name}{RESET}")
+                print("\n".join(f"  {line}" for line in job.output[-40:]) or "  (no output)")
+                if job.result: print(job.result)
+                input(f"\n{G}Back [ENTER]...{RESET}")
 
     def show_help(self):
         self.clear_screen()
@@ -202,7 +2034,7 @@ class FileManager:
         print(f"{B}║{RESET}  [1] REFRESH       - Updates the file view in the current folder.                         {B}║{RESET}")
         print(f"{B}║{RESET}  [2] ENTER (CD)    - Navigates to the specified folder (enter name).                      {B}║{RESET}")
         print(f"{B}║{RESET}  [3] UP (..)       - Returns to the parent directory.                                     {B}║{RESET}")
-        print(f"{B}║{RESET}  [4] DISK INFO     - Displays space usage on the current volume.                          {B}║{RESET}")
+        print(f"{B}║{RESET}  [4] DISK INFO     - Volume usage plus a top-N folder size (du) breakdown.                {B}║{RESET}")
         print(f"{B}║{RESET}                                                                                           {B}║{RESET}")
         print(f"{B}║{RESET}  {Y}2. FILE MANAGEMENT{RESET}                                                                       {B}║{RESET}")
         print(f"{B}║{RESET}  [5] NEW FILE      - Creates an empty text or system file.                                {B}║{RESET}")
@@ -214,14 +2046,18 @@ class FileManager:
         print(f"{B}║{RESET}  [9] RENAME        - Renames a file or folder.                                            {B}║{RESET}")
         print(f"{B}║{RESET}  [10] COPY         - Copies items (requires shutil module).                               {B}║{RESET}")
         print(f"{B}║{RESET}  [11] MOVE         - Moves a file/folder to another location.                             {B}║{RESET}")
-        print(f"{B}║{RESET}  [13] BACKUP       - Creates a backup (Mirror) of the selected source.                    {B}║{RESET}")
+        print(f"{B}║{RESET}  [13] BACKUP       - Full/incremental mirror, or dedup snapshots with restore.            {B}║{RESET}")
         print(f"{B}║{RESET}                                                                                           {B}║{RESET}")
         print(f"{B}║{RESET}  {Y}4. TOOLS AND EXPORT{RESET}                                                                      {B}║{RESET}")
-        print(f"{B}║{RESET}  [12] SAVE LIST    - Exports the file list to .txt format.                                {B}║{RESET}")
-        print(f"{B}║{RESET}  [14] SEARCH       - Searches subdirectories for a given phrase.                          {B}║{RESET}")
+        print(f"{B}║{RESET}  [12] SAVE LIST    - Exports the file list to .txt, or recursively to CSV/JSONL (.gz).    {B}║{RESET}")
+        print(f"{B}║{RESET}  [14] SEARCH       - Indexed name search, or parallel content (grep) search.              {B}║{RESET}")
         print(f"{B}║{RESET}  [15] OPEN SAVES   - Opens the system folder containing saved reports.                    {B}║{RESET}")
+        print(f"{B}║{RESET}  [J]  JOBS        - Background copy/backup/delete/search: progress, output, cancel.       {B}║{RESET}")
+        print(f"{B}║{RESET}  [W]  AUTO-REFRESH- Watches the folder (inotify or polling) and redraws on changes.       {B}║{RESET}")
+        print(f"{B}║{RESET}  [19] DUPLICATES  - Finds identical files (size, partial, full hash); link or delete.     {B}║{RESET}")
+        print(f"{B}║{RESET}  [20] ARCHIVE     - Create/extract zip, tar.gz (multi-core), tar.xz; list contents.       {B}║{RESET}")
         print(f"{B}╠═══════════════════════════════════════════════════════════════════════════════════════════╣{RESET}")
-        print(f"{B}║{RESET}  SHORTCUTS: Select a number [1-18] and press [ENTER].                                     {B}║{RESET}")
+        print(f"{B}║{RESET}  SHORTCUTS: Select a number [1-20] and press [ENTER]. [N]/[P] page, [/x] jump to name.    {B}║{RESET}")
         print(f"{B}╚═══════════════════════════════════════════════════════════════════════════════════════════╝{RESET}")
         input(f"\n{G}  Press [ENTER] to return to menu...{RESET}")
 
@@ -241,5 +2077,17 @@ class FileManager:
         input(f"\n{G}Press [ENTER] to return...{RESET}")
 
 if __name__ == "__main__":
-    app = FileManager()
-    app.run()
\ No newline at end of file
+    parser = argparse.ArgumentParser(description=__desc__)
+    parser.add_argument("--bench", choices=sorted(BENCHMARKS), help="run a performance benchmark and exit")
+    parser.add_argument("--batch", metavar="SCRIPT", help="run a batch script of file operations and exit")
+    parser.add_argument("--dry-run", action="store_true", help="with --batch: print the plan without changing anything")
+    parser.add_argument("--workers", type=int, default=COPY_WORKERS, help=f"copy worker threads (default {COPY_WORKERS})")
+    args = parser.parse_args()
+    COPY_WORKERS = max(1, args.workers)
+    if args.batch:
+        sys.exit(batch_main(args.batch, args.dry_run))
+    elif args.bench:
+        BENCHMARKS[args.bench]()
+    else:
+        app = FileManager()
+        app.run()
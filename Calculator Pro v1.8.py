@@ -1,13 +1,34 @@
 import os
+import re
+import ast
+import csv
 import math
 import sys
+import time
+import heapq
+import struct
+import atexit
+import operator
+import argparse
+import threading
+from array import array
+from collections import OrderedDict, deque
 from datetime import datetime
+from decimal import Decimal, getcontext
+from fractions import Fraction
+from functools import lru_cache
+
+try:
+    import numpy as np
+except ImportError:
+    np = None
 
 # ==============================================================================
 # PATH CONFIGURATION (According to polsoft guidelines)
 # ==============================================================================
 HIST_DIR = os.path.join(os.environ["USERPROFILE"], ".polsoft", "psCli", "Calculator")
-HIST_FILE = os.path.join(HIST_DIR, "history.txt")
+HIST_FILE = os.path.join(HIST_DIR, "history.txt")        # text log (module version), imported on start
+HIST_STORE = os.path.join(HIST_DIR, "history")           # history.dat + history.idx
 
 # Create history folder if it doesn't exist
 if not os.path.exists(HIST_DIR):
@@ -28,29 +49,957 @@ C = {
     "I": "\033[3m"
 }
 
+# ==============================================================================
+# HISTORY STORE
+# ==============================================================================
+# Identical copies live in Calculator Pro v1.8.py, modules/Calculator Pro v1.8 (module).py,
+# games/Tic-Tac-Toe.py and modules/file list generator (module).py; change them together
+if os.name == "nt":
+    import msvcrt
+else:
+    import fcntl
+
+def lock_file(f):
+    """Blocks until this process holds the file's lock (byte 0 on Windows, flock elsewhere)."""
+    if os.name == "nt":
+        f.seek(0)
+        while True:
+            try:
+                msvcrt.locking(f.fileno(), msvcrt.LK_LOCK, 1)
+                return
+            except OSError:   # LK_LOCK gives up after ~10 s; keep waiting
+                continue
+    fcntl.flock(f.fileno(), fcntl.LOCK_EX)
+
+def unlock_file(f):
+    if os.name == "nt":
+        f.seek(0)
+        msvcrt.locking(f.fileno(), msvcrt.LK_UNLCK, 1)
+    else:
+        fcntl.flock(f.fileno(), fcntl.LOCK_UN)
+
+class BufferedLog:
+    """Collects log lines and appends them to the file in one locked write.
+
+    A batch is written when max_records items are pending, max_delay seconds
+    after its first item, on flush() and at exit, so a burst of events costs
+    one open/write/close instead of one per line. The lock keeps batches from
+    several processes sharing the file from interleaving. Subclasses that
+    store something other than text lines override _write().
+    """
+    def __init__(self, path, max_records=64, max_delay=2.0):
+        self.path, self.max_records, self.max_delay = path, max_records, max_delay
+        self.pending, self.timer = [], None
+        self.lock = threading.Lock()
+        atexit.register(self.flush)
+
+    def write(self, item):
+        with self.lock:
+            self.pending.append(item)
+            full = len(self.pending) >= self.max_records
+            if not full and self.timer is None:
+                self.timer = threading.Timer(self.max_delay, self.flush)
+                self.timer.daemon = True
+                self.timer.start()
+        if full:
+            self.flush()
+
+    def flush(self):
+        with self.lock:
+            if self.timer is not None:
+                self.timer.cancel()
+                self.timer = None
+            if self.pending:
+                items, self.pending = self.pending, []
+                self._write(items)
+
+    def _write(self, lines):
+        data = "".join(line if line.endswith("\n") else line + "\n" for line in lines).encode("utf-8")
+        os.makedirs(os.path.dirname(self.path), exist_ok=True)
+        with open(self.path, "ab") as f:
+            lock_file(f)
+            try:
+                f.write(data)
+                f.flush()
+            finally:
+                unlock_file(f)
+
+class HistoryStore(BufferedLog):
+    """Append-only binary history with a fixed-size offset index.
+
+    history.dat holds records <timestamp f64><op length u32><result length u32>
+    followed by the UTF-8 text; history.idx holds one <offset u64><timestamp f64>
+    entry per record. Entry i sits at i * 16, so "last N" seeks straight to its
+    records, and time-range queries scan only the small index, then seek.
+
+    append() only buffers: records are written as one batch when max_records
+    are pending, max_delay seconds after the first one, before any query and
+    at exit. Each batch is written under a lock on history.dat, so several
+    calculators can share one store.
+    """
+    REC = struct.Struct("<dII")
+    IDX = struct.Struct("<Qd")
+
+    def __init__(self, base, max_records=64, max_delay=2.0):
+        self.dat, self.idx = base + ".dat", base + ".idx"
+        self._repair()
+        super().__init__(self.dat, max_records, max_delay)
+
+    def _repair(self):
+        """Indexes records missing from the index and drops a torn record after a crash."""
+        if not os.path.exists(self.dat):
+            return
+        with open(self.idx, "a+b") as idx, open(self.dat, "r+b") as dat:
+            lock_file(dat)
+            size = idx.seek(0, 2)
+            if size % self.IDX.size:
+                size -= size % self.IDX.size
+                idx.truncate(size)
+            pos = 0
+            if size:
+                idx.seek(size - self.IDX.size)
+                pos, _ = self.IDX.unpack(idx.read(self.IDX.size))
+                dat.seek(pos)
+                _, a, b = self.REC.unpack(dat.read(self.REC.size))
+                pos += self.REC.size + a + b
+            dat.seek(pos)
+            while True:
+                head = dat.read(self.REC.size)
+                if len(head) < self.REC.size:
+                    break
+                ts, a, b = self.REC.unpack(head)
+                if len(dat.read(a + b)) < a + b:
+                    break
+                idx.seek(0, 2)
+                idx.write(self.IDX.pack(pos, ts))
+                pos += self.REC.size + a + b
+            dat.truncate(pos)
+            unlock_file(dat)
+
+    def append_many(self, records):
+        """Writes (timestamp, operation, result) records at once; data first, then the index."""
+        data, index = bytearray(), bytearray()
+        with open(self.dat, "ab") as dat:
+            lock_file(dat)
+            try:
+                pos = dat.seek(0, 2)
+                for ts, op, res in records:
+                    op, res = op.encode("utf-8"), res.encode("utf-8")
+                    index += self.IDX.pack(pos + len(data), ts)
+                    data += self.REC.pack(ts, len(op), len(res)) + op + res
+                dat.write(data)
+                dat.flush()
+                with open(self.idx, "ab") as idx:
+                    idx.write(index)
+            finally:
+                unlock_file(dat)
+
+    def append(self, operation, result, ts=None):
+        """Buffers one record; see the class docstring for when it reaches the disk."""
+        self.write((ts or time.time(), str(operation), str(result)))
+
+    _write = append_many   # BufferedLog hands over (timestamp, operation, result) batches
+
+    def count(self):
+        self.flush()
+        return os.path.getsize(self.idx) // self.IDX.size if os.path.exists(self.idx) else 0
+
+    def _read(self, dat, pos):
+        dat.seek(pos)
+        ts, a, b = self.REC.unpack(dat.read(self.REC.size))
+        body = dat.read(a + b)
+        return ts, body[:a].decode("utf-8"), body[a:].decode("utf-8")
+
+    def _range(self, first, last):
+        """Reads records first..last-1 through the index."""
+        if first >= last:
+            return []
+        with open(self.idx, "rb") as idx, open(self.dat, "rb") as dat:
+            idx.seek(first * self.IDX.size)
+            raw = idx.read((last - first) * self.IDX.size)
+            return [self._read(dat, pos) for pos, _ in self.IDX.iter_unpack(raw)]
+
+    def last(self, n):
+        count = self.count()
+        return self._range(max(0, count - n), count)
+
+    def between(self, start, end, limit=None):
+        """Records with start <= timestamp < end, the newest `limit` of them when given.
+
+        Imported text history and batches buffered by other processes arrive
+        out of time order, so the index entries are filtered rather than
+        binary-searched; only the matching records are read from the data file.
+        """
+        if not self.count():
+            return []
+        hits = []   # (timestamp, offset); a min-heap of the newest when limited
+        with open(self.idx, "rb") as idx:
+            while True:
+                chunk = idx.read(self.IDX.size * 65536)
+                if not chunk:
+                    break
+                for pos, ts in self.IDX.iter_unpack(chunk):
+                    if not start <= ts < end: continue
+                    if not limit: hits.append((ts, pos))
+                    elif len(hits) < limit: heapq.heappush(hits, (ts, pos))
+                    else: heapq.heappushpop(hits, (ts, pos))
+        with open(self.dat, "rb") as dat:
+            return [self._read(dat, pos) for _, pos in sorted(hits)]
+
+    def search(self, text, limit=50):
+        """Newest `limit` records whose operation or result contains text (case-insensitive)."""
+        self.flush()
+        if not os.path.exists(self.dat):
+            return []
+        needle, found = text.lower(), deque(maxlen=limit)
+        with open(self.dat, "rb", buffering=1 << 20) as dat:
+            while True:
+                head = dat.read(self.REC.size)
+                if len(head) < self.REC.size:
+                    break
+                ts, a, b = self.REC.unpack(head)
+                body = dat.read(a + b).decode("utf-8")
+                if needle in body.lower():
+                    found.append((ts, body[:a], body[a:]))
+        return list(found)
+
+    def import_text(self, path):
+        """Imports the '[stamp] op = result' lines history.txt gained since the last import.
+
+        The module version of the calculator still writes history.txt, so the
+        file stays in place; the byte offset reached is kept in
+        history.txt.imported, under a lock so two starting calculators never
+        import the same lines. Returns the number of imported records.
+        """
+        if not os.path.exists(path):
+            return 0
+        imported = 0
+        with open(path + ".imported", "a+b") as mark:
+            lock_file(mark)
+            try:
+                mark.seek(0)
+                pos = int(mark.read().strip() or 0)
+                if pos > os.path.getsize(path):
+                    pos = 0   # the text file was replaced or truncated
+                records, ts = [], 0.0
+                with open(path, "rb") as f:
+                    f.seek(pos)
+                    for raw in f:
+                        if not raw.endswith(b"\n"):
+                            break   # a line still being written; next time
+                        pos += len(raw)
+                        line = raw.decode("utf-8", "replace").rstrip("\r\n")
+                        if not line:
+                            continue
+                        if line.startswith("[") and "] " in line:
+                            stamp, _, line = line[1:].partition("] ")
+                            try: ts = datetime.fromisoformat(stamp).timestamp()
+                            except ValueError: pass
+                        op, _, res = line.rpartition(" = ")
+                        records.append((ts, op, res) if op else (ts, line, ""))
+                        if len(records) >= 10000:
+                            self.append_many(records)
+                            imported, records = imported + len(records), []
+                self.append_many(records)
+                imported += len(records)
+                mark.truncate(0)
+                mark.write(str(pos).encode())
+            finally:
+                unlock_file(mark)
+        return imported
+
+STORE = HistoryStore(HIST_STORE)
+
 # ==============================================================================
 # HELPER FUNCTIONS
 # ==============================================================================
 def save_history(operation, result):
-    """Saves the result to %userprofile%\\.polsoft\\psCli\\Calculator\\history.txt"""
-    timestamp = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
+    """Appends the result to the binary history store in %userprofile%\\.polsoft\\psCli\\Calculator"""
     try:
-        with open(HIST_FILE, "a", encoding="utf-8") as f:
-            f.write(f"[{timestamp}] {operation} = {result}\n")
+        STORE.append(operation, result)
     except Exception as e:
         print(f"{C['RED']}History save error: {e}{C['RES']}")
 
 def get_num(prompt_text):
-    """Gets a number and converts comma to dot"""
+    """Gets a number in the active backend (comma is accepted as the decimal point)"""
     try:
-        val = input(prompt_text).replace(",", ".")
-        return float(val)
-    except ValueError:
+        return NUM.parse(input(prompt_text))
+    except (ValueError, ArithmeticError):
         return None
 
 def clear():
     os.system('cls' if os.name == 'nt' else 'clear')
 
+# ==============================================================================
+# NUMERIC BACKENDS
+# ==============================================================================
+BACKENDS = ["float", "decimal", "fraction"]
+INT_RE = re.compile(r"[+-]?\d+")
+MAX_POW_DIGITS = 1_000_000   # refuse exact integer powers longer than this
+SHOW_DIGITS = 1000           # longer integers are shortened on screen and in the history
+
+if hasattr(sys, "set_int_max_str_digits"):
+    sys.set_int_max_str_digits(0)   # big-int results must stay printable
+
+def check_pow_digits(base, exp):
+    """Refuses an exact int/Fraction power base ** exp longer than MAX_POW_DIGITS.
+
+    The size comes from the larger of numerator and denominator, as a
+    negative exponent just swaps them; nothing is computed beforehand.
+    """
+    size = max(abs(base.numerator), base.denominator)
+    if size > 1 and abs(exp) * math.log10(size) > MAX_POW_DIGITS:
+        raise OverflowError(f"result would have more than {MAX_POW_DIGITS} digits")
+
+class Numeric:
+    """Number parsing and the menu operations for the selected backend.
+
+    Integer input stays a Python int in every backend, so +, -, *, exact
+    division and integer powers take the exact big-int path. The backend
+    decides what everything else becomes: float, Decimal (with the
+    configured precision) or Fraction. Trig always works in float.
+    """
+    def __init__(self, backend="float", precision=28):
+        self.precision = precision
+        self.select(backend)
+
+    def select(self, backend, precision=None):
+        self.backend = backend
+        self.precision = precision or self.precision
+        getcontext().prec = self.precision
+
+    def label(self):
+        return f"decimal ({self.precision} digits)" if self.backend == "decimal" else self.backend
+
+    def parse(self, text):
+        text = text.strip().replace(",", ".")
+        if INT_RE.fullmatch(text):
+            return int(text)
+        if self.backend == "decimal":
+            return +Decimal(text)   # unary plus rounds to the context precision
+        if self.backend == "fraction":
+            return Fraction(text)   # also accepts 1/3
+        return float(text)
+
+    def lift(self, x):
+        """Converts an int (or float) operand to the backend type."""
+        if self.backend == "decimal":
+            return Decimal(repr(x)) if isinstance(x, float) else Decimal(x)
+        if self.backend == "fraction":
+            return Fraction(x)
+        return float(x)
+
+    @staticmethod
+    def _wide(x):
+        return Decimal(repr(x)) if isinstance(x, float) else Decimal(x)
+
+    def _checked(self, func, a, b):
+        """func(a, b), finished in Decimal when an int is beyond the double range (float mode)."""
+        try:
+            return func(a, b)
+        except OverflowError:
+            return func(self._wide(a), self._wide(b))
+
+    def add(self, a, b): return self._checked(operator.add, a, b)
+    def sub(self, a, b): return self._checked(operator.sub, a, b)
+    def mul(self, a, b): return self._checked(operator.mul, a, b)
+
+    def div(self, a, b):
+        if isinstance(a, int) and isinstance(b, int) and a % b == 0:
+            return a // b
+        try:
+            return self.lift(a) / self.lift(b)
+        except OverflowError:
+            return self._wide(a) / self._wide(b)
+
+    def pow(self, a, b):
+        if isinstance(a, int) and isinstance(b, int) and b >= 0:
+            check_pow_digits(a, b)
+            return a ** b
+        if self.backend == "float":
+            try:
+                return math.pow(a, b)
+            except OverflowError:
+                # Too large for a double: Decimal has a far wider exponent range
+                return self._wide(a) ** self._wide(b)
+        if self.backend == "fraction" and Fraction(b).denominator == 1:
+            # Integer exponents stay exact here, so 1.5 ^ 10^9 would never finish
+            b = int(b)
+            check_pow_digits(Fraction(a), b)
+        return self.lift(a) ** (b if isinstance(b, int) else self.lift(b))
+
+    def sqrt(self, a):
+        if a < 0:
+            raise ValueError("negative number")
+        if isinstance(a, int) and math.isqrt(a) ** 2 == a:
+            return math.isqrt(a)
+        if self.backend == "decimal":
+            return self.lift(a).sqrt()
+        if self.backend == "fraction":
+            a = Fraction(a)
+            n, d = math.isqrt(a.numerator), math.isqrt(a.denominator)
+            if n * n == a.numerator and d * d == a.denominator:
+                return Fraction(n, d)
+        try:
+            return math.sqrt(a)
+        except OverflowError:
+            return self._wide(a).sqrt()
+
+    def trig(self, func, deg):
+        if not isinstance(deg, float):
+            deg %= 360   # exact for int/Decimal/Fraction, so huge angles still fit a double
+        return getattr(math, func)(math.radians(float(deg)))
+
+def fmt(value):
+    """Shortens huge integers to head...tail so a 100k-digit factorial does not flood the screen.
+
+    int -> str is quadratic (seconds past ~100k digits), so beyond that the
+    head comes from log10 and the tail from a modulo instead. A Fraction is
+    shortened the same way on each side of the slash.
+    """
+    if isinstance(value, Fraction) and value.denominator != 1:
+        return f"{fmt(value.numerator)}/{fmt(value.denominator)}"
+    if not isinstance(value, int) or value.bit_length() <= SHOW_DIGITS * 3.33:
+        return str(value)
+    sign, value = "-" if value < 0 else "", abs(value)
+    if value.bit_length() < 330_000:
+        text = str(value)
+        if len(text) <= SHOW_DIGITS:
+            return sign + text
+        return f"{sign}{text[:40]}...{text[-40:]} ({len(text)} digits)"
+    exp = math.log10(value)
+    head = f"{10 ** (exp - int(exp)):.15f}".replace(".", "")[:16]
+    return f"{sign}{head}...{value % 10**40:040d} (~{int(exp) + 1} digits)"
+
+NUM = Numeric()
+
+# --- Backend benchmark ---
+BENCH_WORKLOADS = [
+    # (name, operations, function(num, n) -> result)
+    ("sum 0.1 (money)", 100000, lambda num, n: _bench_sum(num, n)),
+    ("compound 1.0007", 2000, lambda num, n: _bench_compound(num, n)),
+    ("power 1.5 ^ k", 2000, lambda num, n: _bench_pow(num, n)),
+    ("square roots", 20000, lambda num, n: _bench_sqrt(num, n)),
+    ("big-int product", 3000, lambda num, n: _bench_product(num, n)),
+]
+
+def _bench_sum(num, n):
+    total, step = 0, num.parse("0.1")
+    for _ in range(n):
+        total = total + step
+    return total
+
+def _bench_compound(num, n):
+    value, rate = num.parse("1000"), num.parse("1.0007")
+    for _ in range(n):
+        value = value * rate
+    return value
+
+def _bench_pow(num, n):
+    base = num.parse("1.5")
+    for k in range(n):
+        res = num.pow(base, k % 200)
+    return res
+
+def _bench_sqrt(num, n):
+    for k in range(2, n + 2):
+        res = num.sqrt(num.div(k, 3))
+    return res
+
+def _bench_product(num, n):
+    value = 1
+    for k in range(1, n + 1):
+        value = value * k
+    return value
+
+def run_benchmarks(precision=28):
+    """Times every workload on every backend and prints ops/s and the cost relative to float."""
+    print(f"{C['CYN']}=== Numeric backend benchmark (decimal precision {precision}) ==={C['RES']}")
+    print(f"{'workload':<18}{'backend':<10}{'ops/s':>14}{'vs float':>10}  result")
+    saved = (NUM.backend, NUM.precision)
+    try:
+        for name, ops, work in BENCH_WORKLOADS:
+            base = None
+            for backend in BACKENDS:
+                NUM.select(backend, precision)
+                start = time.perf_counter()
+                res = work(NUM, ops)
+                secs = time.perf_counter() - start
+                base = base or secs
+                shown = fmt(res if not isinstance(res, Fraction) or res.denominator < 10**12 else float(res))
+                print(f"{name:<18}{backend:<10}{ops / secs:>14,.0f}{secs / base:>9.1f}x  {shown[:32]}")
+    finally:
+        NUM.select(*saved)
+
+# ==============================================================================
+# EXPRESSION ENGINE
+# ==============================================================================
+MAX_FACTORIAL = 100_000   # larger factorial/comb/perm arguments would stall the prompt
+
+def checked_pow(a, b):
+    """a ** b, refusing exact integer powers longer than MAX_POW_DIGITS (e.g. 10^10^8)."""
+    if isinstance(a, int) and isinstance(b, int) and b > 0:
+        check_pow_digits(a, b)
+    return a ** b
+
+def _checked_factorial(n):
+    if n > MAX_FACTORIAL: raise OverflowError(f"factorial argument above {MAX_FACTORIAL}")
+    return math.factorial(n)
+
+def _checked_comb(n, k):
+    if min(k, n - k) > MAX_FACTORIAL: raise OverflowError(f"comb argument above {MAX_FACTORIAL}")
+    return math.comb(n, k)
+
+def _checked_perm(n, k=None):
+    if (n if k is None else k) > MAX_FACTORIAL: raise OverflowError(f"perm argument above {MAX_FACTORIAL}")
+    return math.perm(n, k)
+
+# Everything public in math (sin, log, factorial, pi, e, ...) plus a few builtins;
+# _pow is what '**' compiles to
+FUNCS = {name: getattr(math, name) for name in dir(math) if not name.startswith("_")}
+FUNCS.update(abs=abs, round=round, min=min, max=max, _pow=checked_pow,
+             factorial=_checked_factorial, comb=_checked_comb, perm=_checked_perm)
+
+class _CheckedPow(ast.NodeTransformer):
+    def visit_BinOp(self, node):
+        self.generic_visit(node)
+        if isinstance(node.op, ast.Pow):
+            call = ast.Call(ast.Name("_pow", ast.Load()), [node.left, node.right], [])
+            return ast.copy_location(call, node)
+        return node
+
+ALLOWED_NODES = (ast.Expression, ast.BinOp, ast.UnaryOp, ast.Call, ast.Name, ast.Load,
+                 ast.Constant, ast.Add, ast.Sub, ast.Mult, ast.Div, ast.FloorDiv, ast.Mod,
+                 ast.Pow, ast.USub, ast.UAdd)
+
+@lru_cache(maxsize=512)
+def compile_expr(text):
+    """Parses, validates and compiles an expression once; returns (code, variable names).
+
+    '^' means power. Only arithmetic, numbers, variables and calls of FUNCS
+    are accepted, and powers go through checked_pow, so evaluating the code
+    object is safe and cannot stall on a gigantic integer.
+    """
+    tree = ast.parse(text.replace("^", "**"), mode="eval")
+    for node in ast.walk(tree):
+        if not isinstance(node, ALLOWED_NODES):
+            raise ValueError(f"Not allowed in expressions: {type(node).__name__}")
+        if isinstance(node, ast.Call) and not (isinstance(node.func, ast.Name) and node.func.id in FUNCS):
+            raise ValueError("Only math functions can be called")
+        if isinstance(node, ast.Constant) and not isinstance(node.value, (int, float, complex)):
+            raise ValueError("Only numbers are allowed")
+    names = frozenset(n.id for n in ast.walk(tree) if isinstance(n, ast.Name) and n.id not in FUNCS)
+    tree = ast.fix_missing_locations(_CheckedPow().visit(tree))
+    return compile(tree, "<expression>", "eval"), names
+
+@lru_cache(maxsize=4096)
+def _evaluate_cached(text, bound):
+    code, _ = compile_expr(text)
+    return eval(code, {"__builtins__": {}, **FUNCS}, {name: value for name, _, value in bound})
+
+def evaluate(text, variables=None):
+    """Evaluates an expression; repeated (expression, used variable values) pairs hit the cache."""
+    _, names = compile_expr(text)
+    variables = variables or {}
+    missing = names - variables.keys()
+    if missing: raise NameError(f"Unknown variable(s): {', '.join(sorted(missing))}")
+    # The type is part of the key so 1, 1.0 and Decimal(1) never share a cached result
+    return _evaluate_cached(text, tuple(sorted((n, type(variables[n]).__name__, variables[n]) for n in names)))
+
+def make_function(text, *params):
+    """Compiles text once and returns f(*values) for fast repeated evaluation."""
+    code, names = compile_expr(text)
+    unknown = names - set(params)
+    if unknown: raise NameError(f"Unknown variable(s): {', '.join(sorted(unknown))}")
+    env = {"__builtins__": {}, **FUNCS}
+    return lambda *values: eval(code, env, dict(zip(params, values)))
+
+# ==============================================================================
+# BATCH MODE
+# ==============================================================================
+BATCH_CHUNK = 65536   # rows evaluated per vectorized step
+
+# Menu operations over the column value x; b is parenthesized so 1/3 or -2 stay one operand
+BATCH_OPS = {
+    "1": "x + ({b})", "2": "x - ({b})", "3": "x * ({b})", "4": "x / ({b})", "5": "x ^ ({b})",
+    "6": "sqrt(x)", "7": "sin(radians(x))", "8": "cos(radians(x))", "9": "tan(radians(x))",
+}
+
+def _vector_namespace():
+    """NumPy ufuncs under the math names; names NumPy lacks keep the math version."""
+    ns = {"__builtins__": {}}
+    for name, func in FUNCS.items():
+        ns[name] = getattr(np, name, func) if callable(func) else func
+    ns.update(abs=np.abs, round=np.round, min=np.minimum, max=np.maximum, pow=np.power)
+    return ns
+
+def _eval_chunk(text, values, vector_ns):
+    """Evaluates text over a list of x values; returns a list of floats (nan on errors)."""
+    if vector_ns is not None:
+        code, _ = compile_expr(text)
+        arr = np.asarray(values, dtype=float)
+        try:
+            with np.errstate(all="ignore"):
+                out = eval(code, vector_ns, {"x": arr})
+            return np.broadcast_to(np.asarray(out, dtype=float), arr.shape).tolist()
+        except (TypeError, ValueError):
+            pass   # a scalar-only math function (factorial, gamma, ...) - go row by row
+    f = make_function(text, "x")
+    out = []
+    for v in values:
+        try: out.append(f(int(v) if v.is_integer() else v))   # int keeps factorial/comb usable
+        except (ValueError, ArithmeticError, TypeError): out.append(float("nan"))
+    return out
+
+def _read_column(src, column):
+    """Yields (raw, float) pairs from a CSV or a plain column of numbers.
+
+    column is a 1-based index or a header name; a non-numeric first row
+    is treated as the header. Rows that are not numbers yield float None.
+    """
+    with open(src, "r", encoding="utf-8", newline="") as f:
+        rows = csv.reader(f)
+        idx = 0
+        for n, row in enumerate(rows):
+            if not row:
+                continue
+            if n == 0:
+                if column and not column.isdigit():
+                    if column not in row:
+                        raise ValueError(f"No column named '{column}'")
+                    idx = row.index(column)
+                    continue
+                idx = int(column) - 1 if column else 0
+            raw = row[idx].strip() if idx < len(row) else ""
+            try:
+                yield raw, float(raw)
+            except ValueError:
+                if n: yield raw, None
+
+def batch_evaluate(src, dst, text, column=None, report=None):
+    """Streams column values of src through text (in x) into dst as 'x,result' rows.
+
+    Works in BATCH_CHUNK blocks, vectorized with NumPy when installed.
+    Returns (rows, skipped, seconds).
+    """
+    compile_expr(text)   # fail fast on a bad expression
+    vector_ns = _vector_namespace() if np is not None else None
+    rows = skipped = 0
+    start = time.perf_counter()
+    with open(dst, "w", encoding="utf-8", newline="") as out:
+        writer = csv.writer(out)
+        writer.writerow(["x", text])
+        raws, values = [], []
+        for raw, value in _read_column(src, column):
+            if value is None:
+                skipped += 1
+                continue
+            raws.append(raw); values.append(value)
+            if len(values) >= BATCH_CHUNK:
+                writer.writerows(zip(raws, _eval_chunk(text, values, vector_ns)))
+                rows += len(values)
+                raws, values = [], []
+                if report: report(rows, time.perf_counter() - start)
+        if values:
+            writer.writerows(zip(raws, _eval_chunk(text, values, vector_ns)))
+            rows += len(values)
+    secs = time.perf_counter() - start
+    if report: report(rows, secs)
+    return rows, skipped, secs
+
+def batch_mode():
+    clear()
+    print(f"{C['CYN']}=== Batch Mode ==={C['RES']}")
+    print(f"{C['GRY']}Engine: {'NumPy (vectorized)' if np is not None else 'pure Python'}{C['RES']}\n")
+    src = input("Input file (CSV or one number per line): ").strip().strip('"')
+    if not os.path.isfile(src):
+        print(f"{C['RED']}File not found!{C['RES']}")
+        return
+    column = input("Column (name or number, Enter = first): ").strip() or None
+    print(f"{C['GRY']}Operation [1-9] as in the main menu, or an expression in x (e.g. 2*x^2 + 1){C['RES']}")
+    op = input("Operation: ").strip()
+    if op in ["1", "2", "3", "4", "5"]:
+        b = get_num("Second number: ")
+        if b is None:
+            print(f"{C['RED']}Data error!{C['RES']}")
+            return
+        op = BATCH_OPS[op].format(b=b)
+    else:
+        op = BATCH_OPS.get(op, op)
+    base = os.path.splitext(src)[0]
+    dst = input(f"Output file (Enter = {base}_results.csv): ").strip().strip('"') or f"{base}_results.csv"
+
+    def report(rows, secs):
+        print(f"\r  {rows} rows  {rows / secs if secs else 0:,.0f} rows/s", end="", flush=True)
+    try:
+        rows, skipped, secs = batch_evaluate(src, dst, op, column, report)
+    except (SyntaxError, ValueError, NameError, OSError) as e:
+        print(f"{C['RED']}Error: {e}{C['RES']}")
+        return
+    rate = rows / secs if secs else 0
+    print(f"\n{C['GRN']}Done: {C['B']}{rows}{C['RES']}{C['GRN']} rows in {secs:.2f}s ({rate:,.0f} rows/s), {skipped} skipped{C['RES']}")
+    print(f"Results: {C['GRY']}{dst}{C['RES']}")
+    save_history(f"batch {op} over {os.path.basename(src)} ({rows} rows)", dst)
+
+# ==============================================================================
+# TRIG TABLES
+# ==============================================================================
+TRIG_FUNCS = ["sin", "cos", "tan"]
+MAX_TABLE_ROWS = 2_000_000
+MAX_CACHED_ROWS = 4_000_000   # rows kept by TableCache, 64 MB of doubles
+
+def make_table(func, start, stop, step):
+    """Angles start..stop (inclusive, degrees) and func of each.
+
+    Both columns are float64 NumPy arrays, or array('d') without NumPy:
+    8 bytes a value instead of a 24-byte float object plus a list slot.
+    """
+    if step <= 0 or stop < start:
+        raise ValueError("need start <= stop and step > 0")
+    rows = int((stop - start) / step + 1e-9) + 1
+    if rows > MAX_TABLE_ROWS:
+        raise ValueError(f"{rows} rows - the limit is {MAX_TABLE_ROWS}")
+    if np is not None:
+        angles = np.arange(rows) * step + start
+        return angles, getattr(np, func)(np.radians(angles))
+    angles = array("d", (start + i * step for i in range(rows)))
+    return angles, array("d", map(getattr(math, func), map(math.radians, angles)))
+
+class TableCache:
+    """LRU of generated tables keyed by (function, start, stop, step).
+
+    The size limit counts rows rather than tables, so a few 2M-row tables
+    evict each other while many small ones stay; the newest table is always kept.
+    """
+    def __init__(self, max_rows=MAX_CACHED_ROWS):
+        self.max_rows = max_rows
+        self.tables = OrderedDict()
+        self.rows = self.hits = self.misses = 0
+
+    def get(self, func, start, stop, step):
+        key = (func, float(start), float(stop), float(step))
+        table = self.tables.get(key)
+        if table is not None:
+            self.hits += 1
+            self.tables.move_to_end(key)
+            return table
+        self.misses += 1
+        table = self.tables[key] = make_table(*key)
+        self.rows += len(table[0])
+        while self.rows > self.max_rows and len(self.tables) > 1:
+            self.rows -= len(self.tables.popitem(last=False)[1][0])
+        return table
+
+TABLES = TableCache()
+
+def export_table(path, func, table):
+    with open(path, "w", encoding="utf-8", newline="") as f:
+        writer = csv.writer(f)
+        writer.writerow(["degrees", func])
+        writer.writerows(zip(*table))
+
+def table_mode():
+    clear()
+    print(f"{C['CYN']}=== Trig Table ==={C['RES']}")
+    print(f"{C['GRY']}Engine: {'NumPy (vectorized)' if np is not None else 'pure Python'}, "
+          f"cached tables: {len(TABLES.tables)}, {TABLES.rows} rows (hits {TABLES.hits}, misses {TABLES.misses}){C['RES']}\n")
+    func = input("Function (sin/cos/tan): ").strip().lower()
+    if func not in TRIG_FUNCS:
+        print(f"{C['RED']}Unknown function!{C['RES']}")
+        return
+    start, stop, step = get_num("Start (degrees): "), get_num("Stop (degrees): "), get_num("Step: ")
+    if None in (start, stop, step):
+        print(f"{C['RED']}Data error!{C['RES']}")
+        return
+    hits = TABLES.hits
+    try:
+        angles, values = TABLES.get(func, start, stop, step)
+    except ValueError as e:
+        print(f"{C['RED']}Error: {e}{C['RES']}")
+        return
+    print(f"\n{C['GRN']}{len(angles)} rows{' (cached)' if TABLES.hits > hits else ''}{C['RES']}")
+    n = len(angles)
+    shown = list(range(n)) if n <= 20 else list(range(10)) + [None] + list(range(n - 10, n))
+    for i in shown:
+        print("   ..." if i is None else f"  {func}({angles[i]:g}) = {values[i]}")
+    base = f"{func}_{start}_{stop}_{step}.csv"
+    path = input(f"\nExport to CSV (path, '.' = {base}, Enter = skip): ").strip().strip('"')
+    if path:
+        path = base if path == "." else path
+        try:
+            export_table(path, func, (angles, values))
+            print(f"{C['GRN']}Saved: {C['GRY']}{os.path.abspath(path)}{C['RES']}")
+        except OSError as e:
+            print(f"{C['RED']}Error: {e}{C['RES']}")
+    save_history(f"{func} table {start}..{stop} step {step}", f"{len(angles)} rows")
+
+# ==============================================================================
+# MATRIX MODE
+# ==============================================================================
+MATRIX_BLOCK = 64   # tile size of the pure-Python multiply
+
+def load_matrix(text):
+    """Reads a matrix from a CSV file, or inline as '1,2;3,4' (rows split by ';')."""
+    text = text.strip().strip('"')
+    if os.path.isfile(text):
+        with open(text, "r", encoding="utf-8", newline="") as f:
+            rows = [r for r in csv.reader(f) if any(c.strip() for c in r)]
+    else:
+        rows = [r.split(",") for r in text.split(";") if r.strip()]
+    for no, r in enumerate(rows, 1):
+        if any(not c.strip() for c in r):
+            raise ValueError(f"empty cell in row {no}")
+    try:
+        matrix = [[float(c) for c in r] for r in rows]
+    except ValueError:
+        raise ValueError(f"not a numeric matrix or file: {text}")
+    if not matrix or any(len(r) != len(matrix[0]) for r in matrix):
+        raise ValueError("rows must all have the same number of columns")
+    return matrix
+
+def save_matrix(path, matrix):
+    with open(path, "w", encoding="utf-8", newline="") as f:
+        csv.writer(f).writerows(matrix)
+
+def _square(a):
+    if len(a) != len(a[0]):
+        raise ValueError(f"matrix must be square, got {len(a)}x{len(a[0])}")
+
+def mat_mul(a, b):
+    if len(a[0]) != len(b):
+        raise ValueError(f"cannot multiply {len(a)}x{len(a[0])} by {len(b)}x{len(b[0])}")
+    if np is not None:
+        return (np.array(a) @ np.array(b)).tolist()
+    n, k, m = len(a), len(b), len(b[0])
+    c = [[0.0] * m for _ in range(n)]
+    # Tiled i-p-j order: each B row slice is reused across a block of A rows
+    for kk in range(0, k, MATRIX_BLOCK):
+        for jj in range(0, m, MATRIX_BLOCK):
+            je = min(jj + MATRIX_BLOCK, m)
+            for i in range(n):
+                ai, ci = a[i], c[i]
+                acc = ci[jj:je]
+                for p in range(kk, min(kk + MATRIX_BLOCK, k)):
+                    aip = ai[p]
+                    if aip:
+                        acc = [x + aip * y for x, y in zip(acc, b[p][jj:je])]
+                ci[jj:je] = acc
+    return c
+
+def lu_decompose(a):
+    """Gaussian elimination with partial pivoting; returns (LU, row order, sign).
+
+    Raises ValueError for a (numerically) singular matrix.
+    """
+    _square(a)
+    n = len(a)
+    lu, perm, sign = [row[:] for row in a], list(range(n)), 1
+    tol = 1e-12 * max(abs(x) for row in a for x in row)
+    for k in range(n):
+        p = max(range(k, n), key=lambda i: abs(lu[i][k]))
+        if abs(lu[p][k]) <= tol:
+            raise ValueError("matrix is singular")
+        if p != k:
+            lu[k], lu[p] = lu[p], lu[k]
+            perm[k], perm[p] = perm[p], perm[k]
+            sign = -sign
+        pivot_row, pivot = lu[k], lu[k][k]
+        for i in range(k + 1, n):
+            row = lu[i]
+            f = row[k] / pivot
+            row[k] = f
+            if f:
+                row[k + 1:] = [x - f * y for x, y in zip(row[k + 1:], pivot_row[k + 1:])]
+    return lu, perm, sign
+
+def _lu_solve(lu, perm, rhs):
+    n = len(lu)
+    y = [rhs[i] for i in perm]
+    for i in range(n):
+        y[i] -= sum(lu[i][j] * y[j] for j in range(i))
+    for i in reversed(range(n)):
+        y[i] = (y[i] - sum(lu[i][j] * y[j] for j in range(i + 1, n))) / lu[i][i]
+    return y
+
+def determinant(a):
+    _square(a)
+    if np is not None:
+        return float(np.linalg.det(np.array(a)))
+    try:
+        lu, _, sign = lu_decompose(a)
+    except ValueError:
+        return 0.0
+    return sign * math.prod(lu[i][i] for i in range(len(lu)))
+
+def solve(a, b):
+    """Solves A X = B (B has one column per right-hand side)."""
+    _square(a)
+    if len(b) != len(a):
+        raise ValueError(f"B needs {len(a)} rows, got {len(b)}")
+    if np is not None:
+        try:
+            return np.linalg.solve(np.array(a), np.array(b)).tolist()
+        except np.linalg.LinAlgError as e:
+            raise ValueError(str(e))
+    lu, perm, _ = lu_decompose(a)
+    columns = [_lu_solve(lu, perm, list(col)) for col in zip(*b)]
+    return [list(row) for row in zip(*columns)]
+
+def inverse(a):
+    _square(a)
+    if np is not None:
+        try:
+            return np.linalg.inv(np.array(a)).tolist()
+        except np.linalg.LinAlgError as e:
+            raise ValueError(str(e))
+    n = len(a)
+    return solve(a, [[float(i == j) for j in range(n)] for i in range(n)])
+
+def print_matrix(matrix, limit=10):
+    for row in matrix[:limit]:
+        cells = "  ".join(f"{x:>12.6g}" for x in row[:limit])
+        print(f"  {cells}{'  ...' if len(row) > limit else ''}")
+    if len(matrix) > limit:
+        print(f"  ... ({len(matrix)}x{len(matrix[0])})")
+
+def matrix_mode():
+    clear()
+    print(f"{C['CYN']}=== Matrix Mode ==={C['RES']}")
+    print(f"{C['GRY']}Engine: {'NumPy' if np is not None else 'pure Python (blocked)'}; "
+          f"matrices from CSV files or inline as 1,2;3,4{C['RES']}\n")
+    print(f"[1] {C['YLW']}Multiply A x B{C['RES']}   [2] {C['YLW']}Inverse{C['RES']}")
+    print(f"[3] {C['YLW']}Determinant{C['RES']}      [4] {C['YLW']}Solve A x = B{C['RES']}")
+    choice = input("\nSelect: ").strip()
+    if choice not in ["1", "2", "3", "4"]:
+        return
+    try:
+        a = load_matrix(input("Matrix A: "))
+        b = load_matrix(input("Matrix B: ")) if choice in ["1", "4"] else None
+        start = time.perf_counter()
+        if choice == '1': res, op = mat_mul(a, b), "A x B"
+        if choice == '2': res, op = inverse(a), "inv(A)"
+        if choice == '3': res, op = determinant(a), "det(A)"
+        if choice == '4': res, op = solve(a, b), "solve(A, B)"
+        secs = time.perf_counter() - start
+    except (ValueError, OSError) as e:
+        print(f"{C['RED']}Error: {e}{C['RES']}")
+        return
+    size = f"{len(a)}x{len(a[0])}"
+    if choice == '3':
+        print(f"\n{C['GRN']}det(A) = {C['B']}{res}{C['RES']}  {C['GRY']}({secs:.3f}s){C['RES']}")
+        save_history(f"det({size})", res)
+        return
+    print(f"\n{C['GRN']}{op} = {len(res)}x{len(res[0])}{C['RES']}  {C['GRY']}({secs:.3f}s){C['RES']}")
+    print_matrix(res)
+    path = input("\nSave result as CSV (path, Enter = skip): ").strip().strip('"')
+    if path:
+        try:
+            save_matrix(path, res)
+            print(f"{C['GRN']}Saved: {C['GRY']}{os.path.abspath(path)}{C['RES']}")
+        except OSError as e:
+            print(f"{C['RED']}Error: {e}{C['RES']}")
+    save_history(f"{op} (A {size})", f"{len(res)}x{len(res[0])} matrix")
+
 # ==============================================================================
 # FUNCTIONAL MODULES
 # ==============================================================================
@@ -62,34 +1011,110 @@ def show_help():
     print("  - Standard: +, -, *, /")
     print("  - Advanced: Power, Square Root")
     print("  - Trig: Sin, Cos, Tan (provide degrees)")
+    print("  - Trig table [t]: sin/cos/tan over start..stop with a step, CSV export")
+    print("  - Matrix [l]: multiply, inverse, determinant, solve (CSV or 1,2;3,4)")
+    print("  - Number mode [m]: float, decimal (set precision) or fraction;")
+    print("    whole numbers are exact big integers in every mode")
+    print("  - Expression [x]: full formulas, e.g. 2 * (3 + sin(pi / 4)) ^ 2")
+    print("    variables: r = 5, last result: ans, functions: everything from math")
+    print("  - Batch [b]: runs an operation or expression in x over a CSV column")
+    print("    and writes x,result rows to a file (NumPy is used when installed)")
     print(f"\n{C['YLW']}HISTORY:{C['RES']}")
-    print(f"  Path: {C['GRY']}{HIST_FILE}{C['RES']}")
+    print(f"  Path: {C['GRY']}{STORE.dat}{C['RES']}")
+    print("  [h] shows the last 20 entries, [s] searches, [t] picks a time range")
     print(f"\n{C['YLW']}AUTHOR:{C['RES']}")
     print("  Sebastian Januchowski (polsoft.its)")
     print(f"{C['GRY']}==========================================={C['RES']}")
     input("\nPress Enter...")
 
-def show_history():
+def expression_mode():
+    """Interactive expression prompt with variables (x = 2) and 'ans' for the last result."""
     clear()
-    print(f"{C['BLU']}=== Calculator History ==={C['RES']}")
-    print(f"Log: {HIST_FILE}\n")
-    if os.path.exists(HIST_FILE):
-        with open(HIST_FILE, "r", encoding="utf-8") as f:
-            lines = f.readlines()
-            # Show last 20 entries
-            if not lines:
-                print("No entries found.")
-            for line in lines[-20:]:
-                print(line.strip())
-    else:
-        print("No history file found.")
-    input(f"\n{C['GRY']}Press Enter...{C['RES']}")
+    print(f"{C['CYN']}=== Expression Mode ==={C['RES']}")
+    print(f"{C['GRY']}Example: r = 2   then   pi * r^2 + sqrt(ans)   |   'vars' lists variables, empty line exits{C['RES']}\n")
+    variables = {}
+    while True:
+        line = input(f"{C['B']}expr> {C['RES']}").strip()
+        if not line:
+            break
+        if line == "vars":
+            for name, value in variables.items():
+                print(f"  {name} = {value}")
+            continue
+        target, _, text = line.rpartition("=") if "=" in line and not line.startswith("=") else ("", "", line)
+        target, text = target.strip(), text.strip()
+        if target and not target.isidentifier():
+            target, text = "", line
+        try:
+            res = evaluate(text, variables)
+        except (SyntaxError, ValueError, NameError, TypeError, ArithmeticError) as e:
+            print(f"{C['RED']}Error: {e}{C['RES']}")
+            continue
+        variables["ans"] = res
+        if target:
+            variables[target] = res
+        print(f"{C['GRN']}= {C['B']}{fmt(res)}{C['RES']}")
+        save_history(line, fmt(res))
+
+def select_backend():
+    clear()
+    print(f"{C['CYN']}=== Number Mode ==={C['RES']}")
+    print(f"Current: {C['B']}{NUM.label()}{C['RES']}\n")
+    print(f"[1] {C['YLW']}float{C['RES']}     fast, ~16 significant digits")
+    print(f"[2] {C['YLW']}decimal{C['RES']}   exact decimal fractions, configurable precision")
+    print(f"[3] {C['YLW']}fraction{C['RES']}  exact rationals (input like 1/3)")
+    print(f"{C['GRY']}Whole numbers are always exact big integers.{C['RES']}")
+    choice = input("\nSelect: ").strip()
+    if choice not in ["1", "2", "3"]:
+        return
+    backend, precision = BACKENDS[int(choice) - 1], None
+    if backend == "decimal":
+        digits = input(f"Precision in digits (Enter = {NUM.precision}): ").strip()
+        precision = int(digits) if digits.isdigit() and int(digits) > 0 else None
+    NUM.select(backend, precision)
+
+def print_records(records):
+    if not records:
+        print("No entries found.")
+    for ts, op, res in records:
+        print(f"[{datetime.fromtimestamp(ts).strftime('%Y-%m-%d %H:%M:%S')}] {op} = {res}")
+
+def show_history():
+    records = STORE.last(20)
+    while True:
+        clear()
+        print(f"{C['BLU']}=== Calculator History ==={C['RES']}")
+        print(f"Log: {STORE.dat} ({STORE.count()} entries)\n")
+        print_records(records)
+        choice = input(f"\n{C['GRY']}[s] Search  [t] Time range  [l] Last 20  [Enter] Back: {C['RES']}").strip().lower()
+        if choice == 's':
+            text = input("Search for: ").strip()
+            if text:
+                records = STORE.search(text)
+        elif choice == 't':
+            try:
+                start = datetime.fromisoformat(input("From (YYYY-MM-DD [HH:MM]): ").strip()).timestamp()
+                end = input("To (Enter = now): ").strip()
+                end = datetime.fromisoformat(end).timestamp() if end else time.time() + 1
+            except ValueError:
+                print(f"{C['RED']}Invalid date!{C['RES']}")
+                input()
+                continue
+            records = STORE.between(start, end, limit=50)
+        elif choice == 'l':
+            records = STORE.last(20)
+        else:
+            break
 
 # ==============================================================================
 # MAIN PROGRAM LOOP
 # ==============================================================================
 def run_calculator():
     os.system('') # Enable ANSI in Windows CMD
+    try:
+        STORE.import_text(HIST_FILE)
+    except Exception as e:
+        print(f"{C['RED']}History import error: {e}{C['RES']}")
     
     while True:
         clear()
@@ -101,8 +1126,11 @@ def run_calculator():
         print(f"[2] {C['YLW']}Subtraction{C['RES']}   [7] {C['YLW']}Sinus{C['RES']}")
         print(f"[3] {C['YLW']}Multiplication{C['RES']}[8] {C['YLW']}Cosinus{C['RES']}")
         print(f"[4] {C['YLW']}Division{C['RES']}      [9] {C['YLW']}Tangens{C['RES']}")
-        print(f"[5] {C['YLW']}Power{C['RES']}")
-        print(f"\n[h] {C['CYN']}History{C['RES']}    [?] {C['CYN']}Help{C['RES']}    [e] {C['RED']}Exit{C['RES']}\n")
+        print(f"[5] {C['YLW']}Power{C['RES']}         [x] {C['YLW']}Expression{C['RES']}")
+        print(f"[t] {C['YLW']}Trig table{C['RES']}    [b] {C['YLW']}Batch (file){C['RES']}")
+        print(f"[l] {C['YLW']}Matrix{C['RES']}")
+        print(f"\n[h] {C['CYN']}History{C['RES']}    [?] {C['CYN']}Help{C['RES']}    [e] {C['RED']}Exit{C['RES']}")
+        print(f"[m] {C['CYN']}Number mode:{C['RES']} {NUM.label()}\n")
 
         choice = input("Select: ").lower()
 
@@ -114,6 +1142,19 @@ def run_calculator():
             show_help()
         elif choice == 'h':
             show_history()
+        elif choice == 'x':
+            expression_mode()
+        elif choice == 'b':
+            batch_mode()
+            input("\nEnter...")
+        elif choice == 'm':
+            select_backend()
+        elif choice == 't':
+            table_mode()
+            input("\nEnter...")
+        elif choice == 'l':
+            matrix_mode()
+            input("\nEnter...")
         elif choice in ['1', '2', '3', '4', '5', '6', '7', '8', '9']:
             # Arithmetic operations
             if choice in ['1', '2', '3', '4', '5']:
@@ -122,27 +1163,32 @@ def run_calculator():
                 if a is None or b is None:
                     print(f"{C['RED']}Data error!{C['RES']}")
                 else:
-                    if choice == '1': res, op = a + b, f"{a} + {b}"
-                    if choice == '2': res, op = a - b, f"{a} - {b}"
-                    if choice == '3': res, op = a * b, f"{a} * {b}"
-                    if choice == '4':
-                        if b == 0:
-                            print(f"{C['RED']}Division by zero!{C['RES']}")
-                            input()
-                            continue
-                        res, op = a / b, f"{a} / {b}"
-                    if choice == '5': res, op = math.pow(a, b), f"{a} ^ {b}"
+                    if choice == '4' and b == 0:
+                        print(f"{C['RED']}Division by zero!{C['RES']}")
+                        input()
+                        continue
+                    try:
+                        # Decimal overflow (9e999999 * 10) and refused powers land here
+                        if choice == '1': res, op = NUM.add(a, b), f"{a} + {b}"
+                        if choice == '2': res, op = NUM.sub(a, b), f"{a} - {b}"
+                        if choice == '3': res, op = NUM.mul(a, b), f"{a} * {b}"
+                        if choice == '4': res, op = NUM.div(a, b), f"{a} / {b}"
+                        if choice == '5': res, op = NUM.pow(a, b), f"{a} ^ {b}"
+                    except (ArithmeticError, ValueError) as e:
+                        print(f"{C['RED']}Error: {e}{C['RES']}")
+                        input()
+                        continue
                     
-                    print(f"{C['GRN']}Result: {C['B']}{res}{C['RES']}")
-                    save_history(op, res)
+                    print(f"{C['GRN']}Result: {C['B']}{fmt(res)}{C['RES']}")
+                    save_history(op, fmt(res))
             
             # Square root
             elif choice == '6':
                 a = get_num("Number: ")
                 if a is not None and a >= 0:
-                    res = math.sqrt(a)
-                    print(f"{C['GRN']}Result: {C['B']}{res}{C['RES']}")
-                    save_history(f"sqrt({a})", res)
+                    res = NUM.sqrt(a)
+                    print(f"{C['GRN']}Result: {C['B']}{fmt(res)}{C['RES']}")
+                    save_history(f"sqrt({a})", fmt(res))
                 else:
                     print(f"{C['RED']}Error (negative number or invalid data)!{C['RES']}")
             
@@ -150,14 +1196,27 @@ def run_calculator():
             elif choice in ['7', '8', '9']:
                 deg = get_num("Angle (degrees): ")
                 if deg is not None:
-                    rad = math.radians(deg)
-                    if choice == '7': res, func = math.sin(rad), "sin"
-                    if choice == '8': res, func = math.cos(rad), "cos"
-                    if choice == '9': res, func = math.tan(rad), "tan"
+                    func = {'7': "sin", '8': "cos", '9': "tan"}[choice]
+                    try:
+                        res = NUM.trig(func, deg)
+                    except (ArithmeticError, ValueError) as e:
+                        # e.g. 1e100 % 360 needs more digits than the decimal precision
+                        print(f"{C['RED']}Error: {e}{C['RES']}")
+                        input()
+                        continue
                     print(f"{C['GRN']}{func}({deg}) = {C['B']}{res}{C['RES']}")
                     save_history(f"{func}({deg})", res)
             
             input("\nEnter...")
 
 if __name__ == "__main__":
-    run_calculator()
\ No newline at end of file
+    parser = argparse.ArgumentParser(description="Calculator Pro v1.8")
+    parser.add_argument("--backend", choices=BACKENDS, default="float", help="number mode at start")
+    parser.add_argument("--precision", type=int, default=28, help="decimal precision in digits")
+    parser.add_argument("--bench", action="store_true", help="benchmark the number modes and exit")
+    args = parser.parse_args()
+    NUM.select(args.backend, args.precision)
+    if args.bench:
+        run_benchmarks(args.precision)
+    else:
+        run_calculator()
\ No newline at end of file
@@ -1,6 +1,8 @@
 import os
 import time
+import atexit
 import msvcrt
+import threading
 import winsound
 from datetime import datetime
 
@@ -8,6 +10,81 @@ from datetime import datetime
 HISTORY_DIR = os.path.expandvars(r"%userprofile%\.polsoft\psCli\History\Games")
 LOG_FILE = os.path.join(HISTORY_DIR, "game_history.txt")
 
+# Buffered log writer
+# Identical copies live in Calculator Pro v1.8.py, modules/Calculator Pro v1.8 (module).py,
+# games/Tic-Tac-Toe.py and modules/file list generator (module).py; change them together
+if os.name == "nt":
+    import msvcrt
+else:
+    import fcntl
+
+def lock_file(f):
+    """Blocks until this process holds the file's lock (byte 0 on Windows, flock elsewhere)."""
+    if os.name == "nt":
+        f.seek(0)
+        while True:
+            try:
+                msvcrt.locking(f.fileno(), msvcrt.LK_LOCK, 1)
+                return
+            except OSError:   # LK_LOCK gives up after ~10 s; keep waiting
+                continue
+    fcntl.flock(f.fileno(), fcntl.LOCK_EX)
+
+def unlock_file(f):
+    if os.name == "nt":
+        f.seek(0)
+        msvcrt.locking(f.fileno(), msvcrt.LK_UNLCK, 1)
+    else:
+        fcntl.flock(f.fileno(), fcntl.LOCK_UN)
+
+class BufferedLog:
+    """Collects log lines and appends them to the file in one locked write.
+
+    A batch is written when max_records items are pending, max_delay seconds
+    after its first item, on flush() and at exit, so a burst of events costs
+    one open/write/close instead of one per line. The lock keeps batches from
+    several processes sharing the file from interleaving. Subclasses that
+    store something other than text lines override _write().
+    """
+    def __init__(self, path, max_records=64, max_delay=2.0):
+        self.path, self.max_records, self.max_delay = path, max_records, max_delay
+        self.pending, self.timer = [], None
+        self.lock = threading.Lock()
+        atexit.register(self.flush)
+
+    def write(self, item):
+        with self.lock:
+            self.pending.append(item)
+            full = len(self.pending) >= self.max_records
+            if not full and self.timer is None:
+                self.timer = threading.Timer(self.max_delay, self.flush)
+                self.timer.daemon = True
+                self.timer.start()
+        if full:
+            self.flush()
+
+    def flush(self):
+        with self.lock:
+            if self.timer is not None:
+                self.timer.cancel()
+                self.timer = None
+            if self.pending:
+                items, self.pending = self.pending, []
+                self._write(items)
+
+    def _write(self, lines):
+        data = "".join(line if line.endswith("\n") else line + "\n" for line in lines).encode("utf-8")
+        os.makedirs(os.path.dirname(self.path), exist_ok=True)
+        with open(self.path, "ab") as f:
+            lock_file(f)
+            try:
+                f.write(data)
+                f.flush()
+            finally:
+                unlock_file(f)
+
+LOG = BufferedLog(LOG_FILE)
+
 # ANSI Colors
 RESET = "\033[0m"
 RED = "\033[91m"
@@ -39,14 +116,12 @@ def play_sound(event):
         winsound.Beep(300, 500)
 
 def log_result(winner):
-    if not os.path.exists(HISTORY_DIR):
-        os.makedirs(HISTORY_DIR)
     timestamp = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
-    with open(LOG_FILE, "a", encoding="utf-8") as f:
-        result_text = f"Winner: {winner}" if winner != "Draw" else "Draw"
-        f.write(f"[{timestamp}] TicTacToe - {result_text}\n")
+    result_text = f"Winner: {winner}" if winner != "Draw" else "Draw"
+    LOG.write(f"[{timestamp}] TicTacToe - {result_text}")
 
 def show_recent_history():
+    LOG.flush()
     if os.path.exists(LOG_FILE):
         print(f"{GRAY}Recent 5 games:{RESET}")
         try:
@@ -1,10 +1,21 @@
 import os
+import ast
+import csv
 import math
 import sys
+import time
+import atexit
+import threading
 from datetime import datetime
+from functools import lru_cache
 # Importujemy dekorator i kolory bezpośrednio z Twojego pliku cli.py
 from cli import command, Color
 
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
 # --- PLUGIN METADATA (Read by Dispatcher._load_python_module) ---
 __author__ = "Sebastian Januchowski"
 __category__ = "math"
@@ -15,18 +26,86 @@ __desc__ = "Professional scientific calculator with history logging."
 HIST_DIR = os.path.expandvars(r"%userprofile%\.polsoft\psCli\Calculator")
 HIST_FILE = os.path.join(HIST_DIR, "history.txt")
 
+# --- Buffered history writer ---
+# Identical copies live in Calculator Pro v1.8.py, modules/Calculator Pro v1.8 (module).py,
+# games/Tic-Tac-Toe.py and modules/file list generator (module).py; change them together
+if os.name == "nt":
+    import msvcrt
+else:
+    import fcntl
+
+def lock_file(f):
+    """Blocks until this process holds the file's lock (byte 0 on Windows, flock elsewhere)."""
+    if os.name == "nt":
+        f.seek(0)
+        while True:
+            try:
+                msvcrt.locking(f.fileno(), msvcrt.LK_LOCK, 1)
+                return
+            except OSError:   # LK_LOCK gives up after ~10 s; keep waiting
+                continue
+    fcntl.flock(f.fileno(), fcntl.LOCK_EX)
+
+def unlock_file(f):
+    if os.name == "nt":
+        f.seek(0)
+        msvcrt.locking(f.fileno(), msvcrt.LK_UNLCK, 1)
+    else:
+        fcntl.flock(f.fileno(), fcntl.LOCK_UN)
+
+class BufferedLog:
+    """Collects log lines and appends them to the file in one locked write.
+
+    A batch is written when max_records items are pending, max_delay seconds
+    after its first item, on flush() and at exit, so a burst of events costs
+    one open/write/close instead of one per line. The lock keeps batches from
+    several processes sharing the file from interleaving. Subclasses that
+    store something other than text lines override _write().
+    """
+    def __init__(self, path, max_records=64, max_delay=2.0):
+        self.path, self.max_records, self.max_delay = path, max_records, max_delay
+        self.pending, self.timer = [], None
+        self.lock = threading.Lock()
+        atexit.register(self.flush)
+
+    def write(self, item):
+        with self.lock:
+            self.pending.append(item)
+            full = len(self.pending) >= self.max_records
+            if not full and self.timer is None:
+                self.timer = threading.Timer(self.max_delay, self.flush)
+                self.timer.daemon = True
+                self.timer.start()
+        if full:
+            self.flush()
+
+    def flush(self):
+        with self.lock:
+            if self.timer is not None:
+                self.timer.cancel()
+                self.timer = None
+            if self.pending:
+                items, self.pending = self.pending, []
+                self._write(items)
+
+    def _write(self, lines):
+        data = "".join(line if line.endswith("\n") else line + "\n" for line in lines).encode("utf-8")
+        os.makedirs(os.path.dirname(self.path), exist_ok=True)
+        with open(self.path, "ab") as f:
+            lock_file(f)
+            try:
+                f.write(data)
+                f.flush()
+            finally:
+                unlock_file(f)
+
+LOG = BufferedLog(HIST_FILE)
+
 def save_history(operation, result):
-    """Saves calculation logs to the specified history directory."""
-    if not os.path.exists(HIST_DIR):
-        try:
-            os.makedirs(HIST_DIR)
-        except Exception:
-            return # Fail silently if path is inaccessible
-    
+    """Queues a calculation log line; LOG writes the lines to the history directory in batches."""
     timestamp = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
     try:
-        with open(HIST_FILE, "a", encoding="utf-8") as f:
-            f.write(f"[{timestamp}] {operation} = {result}\n")
+        LOG.write(f"[{timestamp}] {operation} = {result}")
     except Exception as e:
         print(f"{Color.RED}[ERROR] Could not save history: {e}{Color.RESET}")
 
@@ -39,10 +118,123 @@ def get_num(prompt_text):
         print(f"{Color.RED}Invalid numeric input.{Color.RESET}")
         return None
 
+# --- Expression batch engine (compact copy of the one in Calculator Pro v1.8.py) ---
+MAX_POW_DIGITS, MAX_FACTORIAL = 1_000_000, 100_000
+
+def checked_pow(a, b):
+    """a ** b ('**' compiles to this), refusing exact powers like 10^10^8 that would stall."""
+    if isinstance(a, int) and isinstance(b, int) and b > 0 and abs(a) > 1 \
+            and b * math.log10(abs(a)) > MAX_POW_DIGITS:
+        raise OverflowError(f"result would have more than {MAX_POW_DIGITS} digits")
+    return a ** b
+
+def _checked_factorial(n):
+    if n > MAX_FACTORIAL: raise OverflowError(f"factorial argument above {MAX_FACTORIAL}")
+    return math.factorial(n)
+
+FUNCS = {name: getattr(math, name) for name in dir(math) if not name.startswith("_")}
+FUNCS.update(abs=abs, round=round, min=min, max=max, _pow=checked_pow, factorial=_checked_factorial)
+
+class _CheckedPow(ast.NodeTransformer):
+    def visit_BinOp(self, node):
+        self.generic_visit(node)
+        if isinstance(node.op, ast.Pow):
+            return ast.copy_location(ast.Call(ast.Name("_pow", ast.Load()), [node.left, node.right], []), node)
+        return node
+ALLOWED_NODES = (ast.Expression, ast.BinOp, ast.UnaryOp, ast.Call, ast.Name, ast.Load, ast.Constant,
+                 ast.Add, ast.Sub, ast.Mult, ast.Div, ast.FloorDiv, ast.Mod, ast.Pow, ast.USub, ast.UAdd)
+BATCH_CHUNK = 65536
+BATCH_OPS = {"1": "x + ({b})", "2": "x - ({b})", "3": "x * ({b})", "4": "x / ({b})", "5": "x ^ ({b})",
+             "6": "sqrt(x)", "7": "sin(radians(x))", "8": "cos(radians(x))", "9": "tan(radians(x))"}
+
+@lru_cache(maxsize=256)
+def compile_expr(text):
+    """Validates and compiles an expression in x once ('^' = power, math functions only)."""
+    tree = ast.parse(text.replace("^", "**"), mode="eval")
+    for node in ast.walk(tree):
+        if not isinstance(node, ALLOWED_NODES):
+            raise ValueError(f"Not allowed in expressions: {type(node).__name__}")
+        if isinstance(node, ast.Call) and not (isinstance(node.func, ast.Name) and node.func.id in FUNCS):
+            raise ValueError("Only math functions can be called")
+        if isinstance(node, ast.Name) and node.id not in FUNCS and node.id != "x":
+            raise NameError(f"Unknown variable: {node.id}")
+        if isinstance(node, ast.Constant) and not isinstance(node.value, (int, float, complex)):
+            raise ValueError("Only numbers are allowed")
+    return compile(ast.fix_missing_locations(_CheckedPow().visit(tree)), "<expression>", "eval")
+
+def _eval_chunk(code, values):
+    """Evaluates code over values - vectorized with NumPy, row by row otherwise (nan on errors)."""
+    if np is not None:
+        ns = {"__builtins__": {}}
+        ns.update({n: getattr(np, n, f) if callable(f) else f for n, f in FUNCS.items()})
+        ns.update(abs=np.abs, round=np.round, min=np.minimum, max=np.maximum, pow=np.power)
+        arr = np.asarray(values, dtype=float)
+        try:
+            with np.errstate(all="ignore"):
+                return np.broadcast_to(np.asarray(eval(code, ns, {"x": arr}), dtype=float), arr.shape).tolist()
+        except (TypeError, ValueError):
+            pass
+    env, out = {"__builtins__": {}, **FUNCS}, []
+    for v in values:
+        try: out.append(eval(code, env, {"x": int(v) if v.is_integer() else v}))
+        except (ValueError, ArithmeticError, TypeError): out.append(float("nan"))
+    return out
+
+def batch_evaluate(src, dst, text, column=None):
+    """Streams a CSV column (1-based index or header name) through text into dst.
+
+    Returns (rows, skipped, seconds).
+    """
+    code = compile_expr(text)
+    rows = skipped = idx = 0
+    start = time.perf_counter()
+    with open(src, "r", encoding="utf-8", newline="") as f, open(dst, "w", encoding="utf-8", newline="") as out:
+        writer = csv.writer(out)
+        writer.writerow(["x", text])
+        raws, values = [], []
+        for n, row in enumerate(csv.reader(f)):
+            if not row:
+                continue
+            if n == 0:
+                if column and not column.isdigit():
+                    if column not in row: raise ValueError(f"No column named '{column}'")
+                    idx = row.index(column)
+                    continue
+                idx = int(column) - 1 if column else 0
+            raw = row[idx].strip() if idx < len(row) else ""
+            try:
+                values.append(float(raw)); raws.append(raw)
+            except ValueError:
+                skipped += 1 if n else 0
+                continue
+            if len(values) >= BATCH_CHUNK:
+                writer.writerows(zip(raws, _eval_chunk(code, values)))
+                rows += len(values)
+                raws, values = [], []
+                print(f"\r  {rows} rows", end="", flush=True)
+        if values:
+            writer.writerows(zip(raws, _eval_chunk(code, values)))
+            rows += len(values)
+    return rows, skipped, time.perf_counter() - start
+
+def run_batch(src, text, dst=None, column=None):
+    """Runs one batch job and prints the rows/s summary."""
+    dst = dst or f"{os.path.splitext(src)[0]}_results.csv"
+    try:
+        rows, skipped, secs = batch_evaluate(src, dst, text, column)
+    except (SyntaxError, ValueError, NameError, OSError) as e:
+        print(f"{Color.RED}Error: {e}{Color.RESET}")
+        return
+    rate = rows / secs if secs else 0
+    print(f"\n{Color.GREEN}{Color.BOLD}{rows} rows in {secs:.2f}s ({rate:,.0f} rows/s), {skipped} skipped{Color.RESET}")
+    print(f"{Color.GRAY}Results: {dst}{Color.RESET}")
+    save_history(f"batch {text} over {os.path.basename(src)} ({rows} rows)", dst)
+
 def show_history_log():
     """Displays the last 15 entries from the history file."""
     print(f"\n{Color.CYAN}=== CALCULATION HISTORY ==={Color.RESET}")
     print(f"{Color.GRAY}Location: {HIST_FILE}{Color.RESET}\n")
+    LOG.flush()
     if os.path.exists(HIST_FILE):
         with open(HIST_FILE, "r", encoding="utf-8") as f:
             lines = f.readlines()
@@ -56,6 +248,10 @@ def show_history_log():
 def run_calculator(*args):
     """Interactive professional calculator module."""
     # args can be used later for direct CLI calculations (e.g., 'calc 2 + 2')
+    # Direct batch run: calc batch <file> "<expression in x>" [output]
+    if len(args) >= 3 and args[0] == "batch":
+        run_batch(args[1], args[2], args[3] if len(args) > 3 else None)
+        return
     
     while True:
         # Clear screen (Windows/Linux)
@@ -72,12 +268,13 @@ def run_calculator(*args):
         print(f"[2] {Color.YELLOW}Subtraction{Color.RESET}    [7] {Color.YELLOW}Sine{Color.RESET}")
         print(f"[3] {Color.YELLOW}Multiplication{Color.RESET} [8] {Color.YELLOW}Cosine{Color.RESET}")
         print(f"[4] {Color.YELLOW}Division{Color.RESET}       [9] {Color.YELLOW}Tangent{Color.RESET}")
-        print(f"[5] {Color.YELLOW}Power{Color.RESET}")
+        print(f"[5] {Color.YELLOW}Power{Color.RESET}          [b] {Color.YELLOW}Batch (file){Color.RESET}")
         print(f"\n[h] {Color.CYAN}History{Color.RESET}    [?] {Color.CYAN}Help{Color.RESET}    [e] {Color.RED}Exit to CLI{Color.RESET}\n")
 
         choice = input(f"{Color.BOLD}Selection » {Color.RESET}").lower()
 
         if choice in ["e", "exit", "quit"]:
+            LOG.flush()   # the CLI keeps running, so do not wait for exit
             break
         elif choice == "h":
             show_history_log()
@@ -85,6 +282,20 @@ def run_calculator(*args):
         elif choice == "?":
             print(f"\n{Color.CYAN}Info:{Color.RESET} Standard double-precision math module.")
             print(f"Trig functions expect degrees as input.")
+            print(f"Batch [b]: operation or expression in x over a CSV column -> x,result file.")
+            input("\nPress Enter...")
+            continue
+        elif choice == "b":
+            print(f"\n{Color.GRAY}Engine: {'NumPy (vectorized)' if np is not None else 'pure Python'}{Color.RESET}")
+            src = input(f"{Color.WHITE}Input file (CSV or one number per line): {Color.RESET}").strip().strip('"')
+            if not os.path.isfile(src):
+                print(f"{Color.RED}File not found.{Color.RESET}")
+            else:
+                column = input(f"{Color.WHITE}Column (name or number, Enter = first): {Color.RESET}").strip() or None
+                op = input(f"{Color.WHITE}Operation [1-9] or expression in x: {Color.RESET}").strip()
+                b = get_num("Enter second number: ") if op in ["1", "2", "3", "4", "5"] else 0
+                if b is not None:
+                    run_batch(src, BATCH_OPS[op].format(b=b) if op in BATCH_OPS else op, column=column)
             input("\nPress Enter...")
             continue
             